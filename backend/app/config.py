@@ -1,103 +1,164 @@
 from __future__ import annotations
 
+import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
-from dotenv import find_dotenv, load_dotenv
-from pydantic import AliasChoices, Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
 
+_ENV_LOADED = False
+_TRUE = frozenset(("1", "true", "yes", "on"))
+# Copia do ambiente tirada apos o load do .env; leituras repetidas usam dict puro.
+_ENV: dict[str, str] = {}
+
+# Nomes legados aceitos no .env -> nome canonico lido pelo Settings.
+# A ordem define a prioridade quando mais de um legado estiver definido.
+_ALIAS_MAP: dict[str, str] = {
+    "url_sei": "SEI_URL",
+    "URL": "SEI_URL",
+    "URL_SEI": "SEI_URL",
+    # USER/USERNAME ficam de fora: o SO sempre os define com o login local.
+    "username": "SEI_USERNAME",
+    "password": "SEI_PASSWORD",
+    "PASSWORD": "SEI_PASSWORD",
+    "PASS": "SEI_PASSWORD",
+}
+
+
+@lru_cache(maxsize=1)
+def _find_env_path() -> str | None:
+    """Locate .env from cwd or parent folders (resolved once per process)."""
+    from dotenv import find_dotenv
 
-def _load_env() -> None:
-    """Load .env from cwd or parent folders."""
     env_path = find_dotenv(filename=".env", usecwd=True)
     if env_path:
-        load_dotenv(env_path, override=False)
-        return
+        return env_path
 
     here = Path(__file__).resolve()
     for parent in [here.parent, *here.parents]:
         candidate = parent / ".env"
         if candidate.exists():
-            load_dotenv(str(candidate), override=False)
-            return
+            return str(candidate)
+    return None
 
 
-_load_env()
+def _load_env() -> None:
+    """Load .env from cwd or parent folders on first use, not at import time."""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
 
+    env_path = _find_env_path()
+    if env_path:
+        from dotenv import load_dotenv
 
-class Settings(BaseSettings):
-    """Project runtime settings loaded from environment variables."""
+        load_dotenv(env_path, override=False)
+    _snapshot_env()
+    _ENV_LOADED = True
 
-    model_config = SettingsConfigDict(extra="ignore")
 
-    sei_url: str | None = Field(
-        default=None,
-        validation_alias=AliasChoices("url_sei", "URL", "SEI_URL", "URL_SEI"),
-    )
-    username: str | None = Field(
-        default=None,
-        validation_alias=AliasChoices("username", "USERNAME", "USER", "SEI_USERNAME"),
-    )
-    password: str | None = Field(
-        default=None,
-        validation_alias=AliasChoices("password", "PASSWORD", "PASS", "SEI_PASSWORD"),
-    )
+def _normalize_env_aliases(env: dict[str, str]) -> None:
+    """Copy legacy env names to their canonical key in the snapshot, without overriding it."""
+    for legacy, canonical in _ALIAS_MAP.items():
+        value = env.get(legacy)
+        if value and canonical not in env:
+            env[canonical] = value
 
-    headless: bool = Field(
-        default=False,
-        validation_alias=AliasChoices("HEADLESS", "headless"),
-    )
-    timeout_seconds: int = Field(
-        default=20,
-        validation_alias=AliasChoices("TIMEOUT_SECONDS", "timeout_seconds"),
-    )
-    manual_login: bool = Field(
-        default=True,
-        validation_alias=AliasChoices("MANUAL_LOGIN", "manual_login"),
-    )
-    manual_login_wait_seconds: int = Field(
-        default=120,
-        validation_alias=AliasChoices(
-            "MANUAL_LOGIN_WAIT_SECONDS",
-            "manual_login_wait_seconds",
-        ),
-    )
-    debug: bool = Field(
-        default=False,
-        validation_alias=AliasChoices("DEBUG", "debug"),
-    )
-    output_dir: str = Field(
-        default="output",
-        validation_alias=AliasChoices("OUTPUT_DIR", "output_dir"),
-    )
-    report_name: str = Field(
-        default="report.json",
-        validation_alias=AliasChoices("REPORT_NAME", "report_name"),
-    )
-    log_level: str = Field(
-        default="INFO",
-        validation_alias=AliasChoices("LOG_LEVEL", "log_level"),
-    )
-    descricoes_busca: str = Field(
-        default="",
-        validation_alias=AliasChoices("DESCRICOES_BUSCA", "descricoes_busca"),
-    )
-    descricoes_match_mode: str = Field(
-        default="contains",
-        validation_alias=AliasChoices("DESCRICOES_MATCH_MODE", "descricoes_match_mode"),
-    )
-    document_types: str = Field(
-        default="pt",
-        validation_alias=AliasChoices("DOCUMENT_TYPES", "document_types"),
-    )
-    export_raw_fields_csv: bool = Field(
-        default=True,
-        validation_alias=AliasChoices("EXPORT_RAW_FIELDS_CSV", "export_raw_fields_csv"),
-    )
+
+def _snapshot_env() -> None:
+    # Aliases resolvidos so na copia: os.environ (herdado pelo chromedriver) nao e alterado.
+    _ENV.clear()
+    _ENV.update(os.environ)
+    _normalize_env_aliases(_ENV)
+
+
+def first_env(*keys: str, default: str | None = None) -> str | None:
+    """Return the first non-empty value among keys, in order."""
+    _load_env()
+    for key in keys:
+        value = _ENV.get(key)
+        if value:
+            return value
+    return default
 
 
-settings = Settings()
+def _env_str(key: str, default: str | None = None) -> str | None:
+    """Read KEY (canonical) or key (legacy lowercase) from the environment."""
+    value = _ENV.get(key)
+    if value is None:
+        value = _ENV.get(key.lower())
+    return default if value is None else value
 
 
+def _strip_env_value(value: str) -> str:
+    # So as pontas: espacos e aspas no meio do valor fazem parte dele.
+    return value.strip().strip("'\"")
+
+
+def _env_bool(key: str, default: bool) -> bool:
+    value = _env_str(key)
+    if value is None or not value.strip():
+        return default
+    return _strip_env_value(value).lower() in _TRUE
+
+
+def _env_int(key: str, default: int) -> int:
+    value = _env_str(key)
+    if value is None:
+        return default
+    try:
+        return int(_strip_env_value(value))
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Project runtime settings loaded from environment variables."""
+
+    sei_url: str | None = None
+    username: str | None = None
+    password: str | None = None
+
+    headless: bool = False
+    block_images: bool = False
+    page_load_strategy: str = "normal"
+    timeout_seconds: int = 20
+    wait_poll_ms: int = 100
+    manual_login: bool = True
+    manual_login_wait_seconds: int = 120
+    debug: bool = False
+    output_dir: str = "output"
+    report_name: str = "report.json"
+    log_level: str = "INFO"
+    descricoes_busca: str = ""
+    descricoes_match_mode: str = "contains"
+    document_types: str = "pt"
+    export_raw_fields_csv: bool = True
+    session_cookies_file: str = ""
+
+
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    return settings
+    _load_env()
+    return Settings(
+        sei_url=_env_str("SEI_URL"),
+        username=_env_str("SEI_USERNAME"),
+        password=_env_str("SEI_PASSWORD"),
+        headless=_env_bool("HEADLESS", False),
+        block_images=_env_bool("BLOCK_IMAGES", False),
+        page_load_strategy=(_env_str("PAGE_LOAD_STRATEGY", "normal") or "normal").lower(),
+        timeout_seconds=_env_int("TIMEOUT_SECONDS", 20),
+        wait_poll_ms=max(10, _env_int("WAIT_POLL_MS", 100)),
+        manual_login=_env_bool("MANUAL_LOGIN", True),
+        manual_login_wait_seconds=_env_int("MANUAL_LOGIN_WAIT_SECONDS", 120),
+        debug=_env_bool("DEBUG", False),
+        output_dir=_env_str("OUTPUT_DIR", "output") or "output",
+        report_name=_env_str("REPORT_NAME", "report.json") or "report.json",
+        log_level=_env_str("LOG_LEVEL", "INFO") or "INFO",
+        descricoes_busca=_env_str("DESCRICOES_BUSCA", "") or "",
+        descricoes_match_mode=_env_str("DESCRICOES_MATCH_MODE", "contains") or "contains",
+        document_types=_env_str("DOCUMENT_TYPES", "pt") or "pt",
+        export_raw_fields_csv=_env_bool("EXPORT_RAW_FIELDS_CSV", True),
+        session_cookies_file=_env_str("SESSION_COOKIES_FILE", "") or "",
+    )
@@ -20,6 +20,22 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 
+_BASE_OPTS_ARGS = (
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-features=Translate",
+)
+
+_PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+# Caminhos resolvidos pelo Selenium Manager na primeira criacao do driver.
+# Reaproveitar evita rodar o subprocesso de resolucao a cada novo driver.
+_resolved_driver_path: str | None = None
+_resolved_browser_path: str | None = None
+
 
 def _prepare_managed_download_dir() -> Path:
     download_dir = Path(__file__).resolve().parents[2] / "output" / "browser_downloads"
@@ -35,19 +51,21 @@ def _prepare_managed_download_dir() -> Path:
     return download_dir
 
 
-def _configure_download_prefs(options: Options) -> Path:
+def _configure_download_prefs(options: Options, *, block_images: bool = False) -> Path:
     download_dir = _prepare_managed_download_dir()
-    options.add_experimental_option(
-        "prefs",
-        {
-            "download.default_directory": str(download_dir),
-            "download.prompt_for_download": False,
-            "download.directory_upgrade": True,
-            "profile.default_content_setting_values.automatic_downloads": 1,
-            "plugins.always_open_pdf_externally": True,
-            "safebrowsing.enabled": True,
-        },
-    )
+    prefs = {
+        "download.default_directory": str(download_dir),
+        "download.prompt_for_download": False,
+        "download.directory_upgrade": True,
+        "profile.default_content_setting_values.automatic_downloads": 1,
+        "profile.default_content_setting_values.notifications": 2,
+        "plugins.always_open_pdf_externally": True,
+        "safebrowsing.enabled": True,
+    }
+    if block_images:
+        # Opcional: varios botoes do SEI sao <img>; so bloqueie se o fluxo usado nao depender deles.
+        prefs["profile.managed_default_content_settings.images"] = 2
+    options.add_experimental_option("prefs", prefs)
     return download_dir
 
 
@@ -66,36 +84,64 @@ def _finalize_driver_downloads(driver: webdriver.Chrome, download_dir: Path) ->
     return driver
 
 
-def create_chrome_driver(*, headless: bool = False) -> webdriver.Chrome:
+def create_chrome_driver(
+    *,
+    headless: bool = False,
+    block_images: bool = False,
+    page_load_strategy: str = "normal",
+) -> webdriver.Chrome:
     options = Options()
+    # "eager" devolve o get() no DOMContentLoaded; as esperas por elemento seguem valendo depois.
+    options.page_load_strategy = page_load_strategy if page_load_strategy in _PAGE_LOAD_STRATEGIES else "normal"
 
     if headless:
         options.add_argument("--headless=new")
     else:
         options.add_argument("--start-maximized")
 
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    download_dir = _configure_download_prefs(options)
+    for arg in _BASE_OPTS_ARGS:
+        options.add_argument(arg)
+    download_dir = _configure_download_prefs(options, block_images=block_images)
 
-    chromedriver_path = os.getenv("CHROMEDRIVER_PATH")
-    if chromedriver_path:
-        service = Service(executable_path=chromedriver_path)
-        driver = webdriver.Chrome(service=service, options=options)
-        driver = _finalize_driver_downloads(driver, download_dir)
-        if not headless:
-            try:
-                driver.maximize_window()
-            except Exception:
-                pass
-        return driver
-
-    driver = webdriver.Chrome(options=options)
-    driver = _finalize_driver_downloads(driver, download_dir)
+    driver = _finalize_driver_downloads(_start_chrome(options), download_dir)
     if not headless:
         try:
             driver.maximize_window()
         except Exception:
             pass
     return driver
+
+
+def attach_chrome_driver(debugger_address: str) -> webdriver.Chrome:
+    """
+    Conecta a um Chrome ja aberto com --remote-debugging-port (ex.: "127.0.0.1:9222").
+    Evita a partida a frio do navegador e mantem a sessao logada entre execucoes; as opcoes de
+    inicializacao (headless, prefs) nao se aplicam a um navegador que ja esta rodando.
+    """
+    options = Options()
+    options.debugger_address = debugger_address
+    download_dir = _prepare_managed_download_dir()
+    return _finalize_driver_downloads(_start_chrome(options), download_dir)
+
+
+def _start_chrome(options: Options) -> webdriver.Chrome:
+    global _resolved_driver_path, _resolved_browser_path
+
+    chromedriver_path = os.getenv("CHROMEDRIVER_PATH")
+    if not chromedriver_path and _resolved_driver_path:
+        chromedriver_path = _resolved_driver_path
+        if _resolved_browser_path and not options.debugger_address:
+            options.binary_location = _resolved_browser_path
+
+    # keep_alive reaproveita a conexao HTTP com o chromedriver entre os comandos (padrao no Selenium 4,
+    # explicito aqui para nao depender da versao instalada).
+    if chromedriver_path:
+        return webdriver.Chrome(
+            service=Service(executable_path=chromedriver_path),
+            options=options,
+            keep_alive=True,
+        )
+    driver = webdriver.Chrome(options=options, keep_alive=True)
+    _resolved_driver_path = getattr(getattr(driver, "service", None), "path", None) or None
+    _resolved_browser_path = options.binary_location or None
+    return driver
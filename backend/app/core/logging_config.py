@@ -16,6 +16,8 @@ _NOISY_LOGGERS = (
     "urllib3.connectionpool",
 )
 
+_CONFIGURED = False
+
 
 class JsonLineFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -37,11 +39,19 @@ def setup_logging(
     level: Optional[str] = None,
     logger_name: str = "dashboard_sei",
 ) -> logging.Logger:
-    """Configure global logging and reduce third-party noise."""
+    """Configure global logging and reduce third-party noise.
+
+    Handlers are installed once per process; later calls only adjust the level.
+    """
+    global _CONFIGURED
     if level is None:
         level = os.getenv("LOG_LEVEL", "INFO")
 
     numeric_level = getattr(logging, level.upper(), logging.INFO)
+    if _CONFIGURED:
+        logging.getLogger().setLevel(numeric_level)
+        return logging.getLogger(logger_name)
+
     output_dir = Path(os.getenv("OUTPUT_DIR", "output")).expanduser()
     output_dir.mkdir(parents=True, exist_ok=True)
     json_log_path = output_dir / "execution_log_latest.json"
@@ -63,6 +73,7 @@ def setup_logging(
     for noisy in _NOISY_LOGGERS:
         logging.getLogger(noisy).setLevel(logging.WARNING)
 
+    _CONFIGURED = True
     logger = logging.getLogger(logger_name)
     logger.info("Log JSON habilitado em: %s", json_log_path)
     return logger
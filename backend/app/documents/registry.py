@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import inspect
+from functools import lru_cache
 from typing import Any, Dict, List
 
 from app.documents.act import build_act_document_type
@@ -12,6 +13,8 @@ from app.documents.types import DocumentTypeSpec
 print("DEBUG registry loaded from:", inspect.getfile(inspect.currentframe()))
 
 
+# As specs sao frozen; o registro e montado uma vez e compartilhado entre instancias.
+@lru_cache(maxsize=1)
 def _build_registry() -> Dict[str, DocumentTypeSpec]:
     act = build_act_document_type()
     memorando = build_memorando_document_type()
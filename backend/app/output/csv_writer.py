@@ -19,3 +19,25 @@ def write_csv(
 ) -> None:
     df = pd.DataFrame(records, columns=list(columns) if columns is not None else None)
     df.to_csv(filepath, index=False, encoding="utf-8-sig")
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # type: ignore
+
+        return True
+    except Exception:
+        return False
+
+
+def write_parquet(
+    records: list[dict[str, Any]],
+    filepath: str | Path,
+    columns: Sequence[str] | None = None,
+) -> bool:
+    # Mesmo conteudo do CSV (tudo texto, vazio em vez de nulo), em formato colunar comprimido.
+    if not parquet_available():
+        return False
+    df = pd.DataFrame(records, columns=list(columns) if columns is not None else None)
+    df.fillna("").astype(str).to_parquet(filepath, index=False, engine="pyarrow", compression="zstd")
+    return True
@@ -5,14 +5,17 @@ import os
 import re
 import time
 import unicodedata
+import weakref
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from selenium.common.exceptions import (
     ElementClickInterceptedException,
     NoSuchElementException,
+    NoSuchWindowException,
     StaleElementReferenceException,
     TimeoutException,
     UnexpectedAlertPresentException,
@@ -20,8 +23,9 @@ from selenium.common.exceptions import (
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.wait import POLL_FREQUENCY
 
-from app.config import get_settings
+from app.config import Settings, first_env, get_settings
 from app.core.driver_factory import create_chrome_driver
 from app.core.logging_config import setup_logger
 from app.documents import resolve_document_types
@@ -66,21 +70,80 @@ from app.services.ted_api_processor import (
     processar_ted_api,
 )
 from app.rpa.selenium_utils import (
+    RENDERED_TEXT_JS,
+    get_elements_text,
     get_iframes_info,
+    get_texts_by_xpath,
+    retry_on_stale,
     wait_for_clickable as selenium_wait_for_clickable,
     wait_for_document_ready as selenium_wait_for_document_ready,
     wait_for_elements as selenium_wait_for_elements,
+    xpath_text_literal,
 )
 from app.rpa.selectors import load_xpath_selectors
 
 POST_LOGIN_REFRESH_SLEEP_SECONDS = 1.0
+SESSION_COOKIES_MAX_AGE_SECONDS = 8 * 3600
+SESSION_COOKIES_PROBE_SECONDS = 8
 UI_SETTLE_SLEEP_SECONDS = 0.35
+POST_LOGIN_MENU_POLL_SECONDS = 0.1
 PAGINATION_SETTLE_SLEEP_SECONDS = 0.25
 OVERLAY_WAIT_POLL_SECONDS = 0.1
 OVERLAY_WAIT_FALLBACK_SLEEP_SECONDS = 0.1
 WINDOW_HANDLE_WAIT_POLL_SECONDS = 0.1
 WINDOW_HANDLE_WAIT_FALLBACK_SLEEP_SECONDS = 0.1
 PESQUISA_SESSION_UNSET = object()
+# Textos de status que aparecem em colunas da tabela de internos e nao sao descricao.
+INVALID_DESCRICAO_VALUES = frozenset({"GERADO", "RECEBIDO", "CONCLUIDO"})
+REQUIRED_SELECTOR_PATHS = ("tela_inicio.bloco", "tela_inicio.interno", "interno.processo")
+# Leitor de linhas de interno instalado uma vez por documento em window; as chamadas seguintes
+# enviam so o guard curto. Se a pagina navegou e perdeu a funcao, o guard devolve o marcador.
+INTERNO_ROWS_FN_NAME = "__seiInternoRows"
+INTERNO_ROWS_MISSING = "__sei_missing__"
+INTERNO_ROWS_BODY = (
+    "const rows = arguments[0], xLink = arguments[1], xDesc = arguments[2];"
+    + RENDERED_TEXT_JS
+    + "const text = renderedText;"
+    "const all = (xp, ctx) => {"
+    "  const doc = ctx.ownerDocument || document;"
+    "  const r = doc.evaluate(xp, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);"
+    "  const out = [];"
+    "  for (let i = 0; i < r.snapshotLength; i++) { out.push(r.snapshotItem(i)); }"
+    "  return out;"
+    "};"
+    "return Array.prototype.map.call(rows, (row) => {"
+    "  const link = all(xLink, row)[0] || null;"
+    "  if (!link) { return [null, '', [], []]; }"
+    "  const plain = all(\".//td[not(contains(@class,'d-none'))]\", row)"
+    "    .filter((td) => !td.querySelector('a, img, input, button'));"
+    "  return [link, text(link), all(xDesc, row).map(text), plain.map(text)];"
+    "});"
+)
+INTERNO_ROWS_CALL_SCRIPT = (
+    f"const fn = window.{INTERNO_ROWS_FN_NAME};"
+    f"return typeof fn === 'function' ? fn.apply(null, arguments) : '{INTERNO_ROWS_MISSING}';"
+)
+INTERNO_ROWS_INSTALL_SCRIPT = (
+    f"window.{INTERNO_ROWS_FN_NAME} = function () {{{INTERNO_ROWS_BODY}}};"
+    f"return window.{INTERNO_ROWS_FN_NAME}.apply(null, arguments);"
+)
+GATEWAY_TIMEOUT_BODY_EXPRESSION = "((document.body || document.documentElement || {}).innerText || '').slice(0, 4000)"
+GATEWAY_TIMEOUT_BODY_SCRIPT = f"return {GATEWAY_TIMEOUT_BODY_EXPRESSION};"
+POST_LOGIN_PROBE_SCRIPT = (
+    "let menu = false;"
+    "if (arguments[0]) {"
+    "  try {"
+    "    menu = !!document.evaluate(arguments[0], document, null, "
+    "XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;"
+    "  } catch (e) { menu = false; }"
+    "}"
+    f"return [window.location.href, document.title, menu, {GATEWAY_TIMEOUT_BODY_EXPRESSION}];"
+)
+# Lookup por id/name resolvido pelo motor CSS nativo do navegador, sem passar pelo XPath.
+IFR_ARVORE_CSS = "iframe#ifrArvore, iframe[name='ifrArvore']"
+
+# Termos fixos (tree_match_terms, padroes de perfil) normalizados na primeira vez que sao usados.
+_NORMALIZED_TERMS_CACHE: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
 
 
 @dataclass
@@ -96,6 +159,8 @@ class InternoRow:
     link: Any
     page: int
     row_index: int
+    # Texto exibido do link (com espacos colapsados), usado para relocalizar o link via XPath.
+    numero_interno_raw: str = ""
 
 
 @dataclass
@@ -136,10 +201,66 @@ class PesquisaFilterSession:
     last_validated_at: float = 0.0
 
 
+def _quit_driver_quietly(driver: Any) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
 def _compact_text(value: str) -> str:
     return " ".join((value or "").split()).strip()
 
 
+def _has_gateway_timeout_markers(text: str) -> bool:
+    normalized = re.sub(r"[\s\-_]+", " ", text)
+    markers = (
+        "gateway timeout",
+        "gateway time out",
+        "504 gateway timeout",
+        "504 gateway time out",
+        "erro 504",
+        "error 504",
+        "http error 504",
+        "http 504",
+        "the server didn't respond in time",
+        "server didn't respond in time",
+    )
+    if any(marker in normalized for marker in markers):
+        return True
+
+    if "504" in normalized and ("gateway" in normalized or "time out" in normalized or "timeout" in normalized):
+        return True
+
+    return False
+
+
+class _CombiningStripTable(dict):
+    # Tabela do str.translate preenchida sob demanda: cada code point consulta
+    # unicodedata.combining uma unica vez; dai em diante o laco roda todo em C.
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        value = None if unicodedata.combining(chr(codepoint)) else codepoint
+        self[codepoint] = value
+        return value
+
+
+_COMBINING_STRIP_TABLE = _CombiningStripTable()
+
+
+# Numeros/descricoes de internos se repetem entre paginas e re-coletas; evita refazer o NFKD.
+@lru_cache(maxsize=8192)
+def _normalize_text_cached(value: str) -> str:
+    fixed = value
+    if any(marker in fixed for marker in ("\u00C3", "\u00C2", "\uFFFD")):
+        try:
+            fixed = fixed.encode("latin1").decode("utf-8")
+        except UnicodeError:
+            fixed = value
+
+    collapsed = " ".join(fixed.split()).strip().upper()
+    return unicodedata.normalize("NFKD", collapsed).translate(_COMBINING_STRIP_TABLE)
+
+
 def _click_optional_popup(
     driver: Any,
     xpath: str,
@@ -264,39 +385,41 @@ def _wait_for_page_signature_change(
 class SEIScraper:
 
     # Setup / lifecycle
-    def __init__(self) -> None:
+    def __init__(self, *, driver: Any | None = None, settings: Settings | None = None) -> None:
         self.logger = setup_logger()
 
-        cfg = get_settings()
+        cfg = settings or get_settings()
         self.settings = cfg
         self.logger.info("DEBUG CFG document_types raw: %s", cfg.document_types)
-        self.logger.info("DEBUG ENV DOCUMENT_TYPES: %s", os.getenv("DOCUMENT_TYPES"))
-        self.base_url = (
-            cfg.sei_url
-            or os.getenv("URL")
-            or os.getenv("url_sei")
-            or os.getenv("SEI_URL")
-            or os.getenv("URL_SEI")
-        )
-        self.username = (
-            cfg.username
-            or os.getenv("USERNAME")
-            or os.getenv("username")
-            or os.getenv("USER")
-            or os.getenv("SEI_USERNAME")
-        )
-        self.password = (
-            cfg.password
-            or os.getenv("PASSWORD")
-            or os.getenv("password")
-            or os.getenv("PASS")
-            or os.getenv("SEI_PASSWORD")
-        )
+        self.logger.info("DEBUG ENV DOCUMENT_TYPES: %s", first_env("DOCUMENT_TYPES"))
+        self.base_url = cfg.sei_url or first_env("URL", "url_sei", "SEI_URL", "URL_SEI")
+        self.username = cfg.username or first_env("username", "SEI_USERNAME")
+        self.password = cfg.password or first_env("PASSWORD", "password", "PASS", "SEI_PASSWORD")
 
-        self.driver = create_chrome_driver(headless=cfg.headless)
-        self.wait = WebDriverWait(self.driver, cfg.timeout_seconds)
-        self.timeout_seconds = cfg.timeout_seconds
+        # Seletores validados antes de abrir o Chrome: falha na hora, nao no meio do fluxo.
         self.selectors = load_xpath_selectors()
+        missing_selectors = [path for path in REQUIRED_SELECTOR_PATHS if not self.selectors.get(path)]
+        if missing_selectors:
+            raise RuntimeError(
+                f"Seletores obrigatorios ausentes em {self.selectors.source_path}: {', '.join(missing_selectors)}"
+            )
+
+        # Um driver injetado pertence a quem o criou; so encerramos o Chrome que abrimos aqui.
+        self._driver_finalizer: Optional[weakref.finalize] = None
+        if driver is not None:
+            self.driver = driver
+        else:
+            self.driver = create_chrome_driver(
+                headless=cfg.headless,
+                block_images=cfg.block_images,
+                page_load_strategy=cfg.page_load_strategy,
+            )
+            # Garante o quit do Chrome mesmo se close() nao for chamado (GC ou saida do interpretador).
+            self._driver_finalizer = weakref.finalize(self, _quit_driver_quietly, self.driver)
+        wait_poll_seconds = cfg.wait_poll_ms / 1000
+        setattr(self.driver, "_sei_wait_poll_seconds", wait_poll_seconds)
+        self.wait = WebDriverWait(self.driver, cfg.timeout_seconds, poll_frequency=wait_poll_seconds)
+        self.timeout_seconds = cfg.timeout_seconds
         self.main_window_handle: Optional[str] = None
         self.found: Set[str] = set()
         self.document_types = resolve_document_types(cfg.document_types, logger=self.logger)
@@ -310,6 +433,7 @@ class SEIScraper:
         self._process_filter_sessions: Dict[Tuple[str, str], PesquisaFilterSession] = {}
         self._process_filter_recovery_attempts: Dict[Tuple[str, str], int] = {}
         self._process_act_found: Dict[str, bool] = {}
+        self._interno_list_shown_page: Optional[int] = None
         self._preview_records_by_processo: Dict[str, Dict[str, str]] = {}
         self._ted_api_results: Dict[str, Dict[str, Any]] = {}
         self.performance_profiler = PerformanceProfiler()
@@ -332,6 +456,17 @@ class SEIScraper:
             )
             self.descricao_match_mode = "contains"
 
+    def close(self) -> None:
+        finalizer = getattr(self, "_driver_finalizer", None)
+        if finalizer is not None:
+            finalizer()
+
+    def __enter__(self) -> "SEIScraper":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _prepare_output_dir_for_run(self) -> None:
         output_dir = self._resolve_preview_output_dir()
         csv_writer.ensure_output_dir(output_dir)
@@ -380,11 +515,18 @@ class SEIScraper:
 
             self.logger.info("Abrindo SEI em: %s", self.base_url)
             self.driver.get(self.base_url)
+            if getattr(getattr(self, "settings", None), "page_load_strategy", "normal") != "normal":
+                self._wait_for_navigation_committed(self.timeout_seconds, "abrir_sei")
 
-            if manual_login:
-                self._wait_for_manual_login()
+            # Cookies so sao regravados apos um login novo: o mtime do arquivo marca a idade do login.
+            if self._restore_session_cookies():
+                self.logger.info("Sessao anterior reaproveitada; login dispensado.")
             else:
-                self._login_if_possible()
+                if manual_login:
+                    self._wait_for_manual_login()
+                else:
+                    self._login_if_possible()
+                self._save_session_cookies()
             self._remember_main_window_handle(context="pos_login")
             self.logger.info("=== START SCRAPING === %s", datetime.now().isoformat())
 
@@ -520,6 +662,17 @@ class SEIScraper:
     def _wait_for_document_ready(self, timeout: int, tag: str) -> None:
         selenium_wait_for_document_ready(self.driver, timeout, tag, self.logger)
 
+    def _wait_for_navigation_committed(self, timeout: int, tag: str) -> None:
+        # Com pageLoadStrategy eager/none o get() volta antes do novo documento existir;
+        # basta ele sair de "loading" para cookies e esperas por elemento valerem.
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=POST_LOGIN_MENU_POLL_SECONDS).until(
+                lambda d: (d.current_url or "").startswith("http")
+                and d.execute_script("return document.readyState") != "loading"
+            )
+        except TimeoutException:
+            self.logger.warning("Timeout aguardando a navegacao iniciar (%s); seguindo com as esperas por elemento.", tag)
+
 
     def wait_for_elements(
         self,
@@ -556,6 +709,56 @@ class SEIScraper:
         wait_seconds = max(5, cfg.manual_login_wait_seconds)
         self._wait_for_post_login_ready(wait_seconds)
 
+    def _session_cookies_path(self) -> Optional[Path]:
+        raw = (getattr(getattr(self, "settings", None), "session_cookies_file", "") or "").strip()
+        return Path(raw).expanduser() if raw else None
+
+    def _restore_session_cookies(self) -> bool:
+        path = self._session_cookies_path()
+        if path is None or not path.is_file():
+            return False
+        age_seconds = time.time() - path.stat().st_mtime
+        if age_seconds > SESSION_COOKIES_MAX_AGE_SECONDS:
+            self.logger.info("Cookies de sessao expirados (%.0fs); seguindo com login.", age_seconds)
+            return False
+
+        try:
+            cookies = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            self.logger.warning("Falha ao ler cookies de sessao em %s: %s", path, exc)
+            return False
+
+        for cookie in cookies if isinstance(cookies, list) else []:
+            try:
+                self.driver.add_cookie(cookie)
+            except WebDriverException:
+                continue
+
+        try:
+            self.driver.get(self.base_url)
+            self._wait_for_post_login_ready(SESSION_COOKIES_PROBE_SECONDS)
+        except (RuntimeError, WebDriverException) as exc:
+            self.logger.info("Cookies de sessao nao autenticaram (%s); seguindo com login.", exc)
+            return False
+        return True
+
+    def _save_session_cookies(self) -> None:
+        path = self._session_cookies_path()
+        if path is None:
+            return
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        try:
+            payload = json.dumps(self.driver.get_cookies())
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.unlink(missing_ok=True)
+            # Arquivo ja nasce com 0600 (nunca fica legivel por outros usuarios) e substitui o antigo atomicamente.
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(tmp_path, path)
+        except (OSError, WebDriverException) as exc:
+            self.logger.warning("Falha ao salvar cookies de sessao em %s: %s", path, exc)
+
     def _consume_login_alert_if_present(self, exc: Exception | None = None) -> str:
         alert_text = ""
         if isinstance(exc, UnexpectedAlertPresentException):
@@ -610,38 +813,57 @@ class SEIScraper:
         )
 
         while time.time() < deadline:
-            if self._handle_login_alert():
-                profiler_sleep(UI_SETTLE_SLEEP_SECONDS)
-                continue
-
+            # URL, titulo, menu e trecho do corpo em um unico execute_script por volta.
             try:
-                current_url = (self.driver.current_url or "").lower()
+                probe = self._probe_post_login_state(x_bloco)
             except UnexpectedAlertPresentException as exc:
                 if self._handle_login_alert(exc):
                     profiler_sleep(UI_SETTLE_SLEEP_SECONDS)
                     continue
                 raise
 
+            if probe is None:
+                if self._handle_login_alert():
+                    profiler_sleep(UI_SETTLE_SLEEP_SECONDS)
+                    continue
+
+                try:
+                    current_url = (self.driver.current_url or "").lower()
+                except UnexpectedAlertPresentException as exc:
+                    if self._handle_login_alert(exc):
+                        profiler_sleep(UI_SETTLE_SLEEP_SECONDS)
+                        continue
+                    raise
+                menu_found = bool(x_bloco and self.driver.find_elements(By.XPATH, x_bloco))
+            else:
+                current_url, title, menu_found, body = probe
+
             # Sinal 1: URL de destino conhecida apos login.
             if all(marker in current_url for marker in post_login_url_markers):
-                self.logger.info("Login confirmado por mudanca de URL: %s", self.driver.current_url)
+                self.logger.info("Login confirmado por mudanca de URL: %s", current_url)
                 return
 
             # Sinal 2: URL nao parece mais ser a tela de login.
             if current_url and not all(marker in current_url for marker in login_url_markers):
-                if x_bloco and self.driver.find_elements(By.XPATH, x_bloco):
+                if menu_found:
                     self.logger.info("Login confirmado: menu principal encontrado apos mudanca de URL.")
                     return
                 if "/sei/" in current_url:
-                    self.logger.info("Login confirmado por URL no contexto /sei/: %s", self.driver.current_url)
+                    self.logger.info("Login confirmado por URL no contexto /sei/: %s", current_url)
                     return
 
             # Sinal 3: fallback por elemento do menu principal.
-            if x_bloco and self.driver.find_elements(By.XPATH, x_bloco):
+            if menu_found:
                 self.logger.info("Login confirmado: menu principal encontrado.")
                 return
 
-            if self._is_gateway_timeout_page():
+            if probe is None:
+                gateway_timeout = self._is_gateway_timeout_page()
+            else:
+                gateway_timeout = _has_gateway_timeout_markers(f"{title} {current_url}") or (
+                    not title.startswith("sei") and _has_gateway_timeout_markers(body)
+                )
+            if gateway_timeout:
                 gateway_timeout_hits += 1
                 last_gateway_timeout_state = self._describe_current_page_state()
                 if gateway_timeout_hits <= gateway_timeout_retry_limit:
@@ -656,7 +878,11 @@ class SEIScraper:
                         self.driver.refresh()
                     except WebDriverException as exc:
                         self.logger.warning("Falha ao recarregar pagina apos 504: %s", exc)
-                    profiler_sleep(POST_LOGIN_REFRESH_SLEEP_SECONDS)
+                    if x_bloco:
+                        # Mantem o intervalo apos o refresh como teto, mas retoma assim que o menu aparecer.
+                        self._wait_for_main_menu(x_bloco, POST_LOGIN_REFRESH_SLEEP_SECONDS)
+                    else:
+                        profiler_sleep(POST_LOGIN_REFRESH_SLEEP_SECONDS)
                     continue
 
                 raise RuntimeError(
@@ -664,7 +890,14 @@ class SEIScraper:
                     "Interrompendo execucao para evitar loop."
                 )
 
-            profiler_sleep(UI_SETTLE_SLEEP_SECONDS)
+            if not x_bloco:
+                profiler_sleep(UI_SETTLE_SLEEP_SECONDS)
+                continue
+
+            # Em vez de dormir o intervalo inteiro, sai assim que o menu principal aparecer.
+            if self._wait_for_main_menu(x_bloco, UI_SETTLE_SLEEP_SECONDS):
+                self.logger.info("Login confirmado: menu principal encontrado.")
+                return
 
         final_state = self._describe_current_page_state()
         if gateway_timeout_hits:
@@ -678,35 +911,65 @@ class SEIScraper:
             f"Confirme se o processo foi concluido no navegador. estado_final={final_state}"
         )
 
+    def _probe_post_login_state(self, x_bloco: str | None) -> Optional[Tuple[str, str, bool, str]]:
+        # (url, titulo, menu presente, corpo) em minusculas; None quando o driver nao executa JS.
+        try:
+            raw = self.driver.execute_script(POST_LOGIN_PROBE_SCRIPT, x_bloco or "")
+        except UnexpectedAlertPresentException:
+            raise
+        except (AttributeError, WebDriverException):
+            return None
+        if not isinstance(raw, list) or len(raw) != 4:
+            return None
+        url, title, menu_found, body = raw
+        return (
+            str(url or "").lower(),
+            str(title or "").lower(),
+            bool(menu_found),
+            str(body or "").lower(),
+        )
+
+    def _wait_for_main_menu(self, x_bloco: str, timeout_seconds: float) -> bool:
+        try:
+            WebDriverWait(
+                self.driver,
+                timeout_seconds,
+                poll_frequency=POST_LOGIN_MENU_POLL_SECONDS,
+            ).until(lambda d: d.find_elements(By.XPATH, x_bloco))
+        except (TimeoutException, UnexpectedAlertPresentException):
+            return False
+        return True
+
     def _is_gateway_timeout_page(self) -> bool:
         try:
             title = (self.driver.title or "").lower()
             url = (self.driver.current_url or "").lower()
-            html = (self.driver.page_source or "")[:12000].lower()
         except WebDriverException:
             return False
 
-        combined = f"{title} {url} {html}"
-        normalized = re.sub(r"[\s\-_]+", " ", combined)
-        markers = (
-            "gateway timeout",
-            "gateway time out",
-            "504 gateway timeout",
-            "504 gateway time out",
-            "erro 504",
-            "error 504",
-            "http error 504",
-            "http 504",
-            "the server didn't respond in time",
-            "server didn't respond in time",
-        )
-        if any(marker in normalized for marker in markers):
-            return True
-
-        if "504" in normalized and ("gateway" in normalized or "time out" in normalized or "timeout" in normalized):
+        if _has_gateway_timeout_markers(f"{title} {url}"):
             return True
+        # Pagina do proprio SEI ja identificada pelo titulo: nao vale trafegar o corpo.
+        if title.startswith("sei"):
+            return False
 
-        return False
+        try:
+            body = self.driver.execute_script(GATEWAY_TIMEOUT_BODY_SCRIPT)
+        except WebDriverException:
+            body = None
+        if not isinstance(body, str):
+            # Fallback via CDP ainda limitado a 4000 caracteres; nunca serializa o page_source inteiro.
+            try:
+                evaluated = self.driver.execute_cdp_cmd(
+                    "Runtime.evaluate",
+                    {"expression": GATEWAY_TIMEOUT_BODY_EXPRESSION, "returnByValue": True},
+                )
+                body = evaluated["result"]["value"]
+            except (AttributeError, KeyError, TypeError, WebDriverException):
+                return False
+            if not isinstance(body, str):
+                return False
+        return _has_gateway_timeout_markers(body.lower())
 
     def _describe_current_page_state(self) -> str:
         try:
@@ -784,48 +1047,65 @@ class SEIScraper:
 
     # Helpers de seletores / clique
     def _click_first_clickable(self, xpaths: List[str], label: str) -> None:
-        checked: List[str] = []
+        checked = [xpath for xpath in dict.fromkeys(xpaths) if xpath]
+        if not checked:
+            raise ValueError(f"Nenhuma XPath informada para '{label}'.")
         candidate_timeout = max(3, min(8, self.timeout_seconds))
-        for idx, xpath in enumerate(xpaths, start=1):
-            if not xpath or xpath in checked:
-                continue
-            checked.append(xpath)
+        poll_seconds = getattr(self.driver, "_sei_wait_poll_seconds", None)
+        if not isinstance(poll_seconds, (int, float)):
+            poll_seconds = POLL_FREQUENCY
+
+        def first_clickable(_driver: Any) -> Any:
+            # Percorre as candidatas em ordem de prioridade a cada poll: o pior caso e 1x o timeout, nao Nx.
+            for candidate_idx, candidate in enumerate(checked, start=1):
+                candidate_elem = self._first_displayed_element(candidate)
+                if candidate_elem is not None:
+                    return candidate_idx, candidate, candidate_elem
+            return False
+
+        try:
+            idx, xpath, elem = WebDriverWait(
+                self.driver,
+                candidate_timeout,
+                poll_frequency=poll_seconds,
+            ).until(first_clickable)
+        except TimeoutException as exc:
+            raise TimeoutException(
+                f"Nao localizei elemento clicavel para '{label}'. XPaths tentados: {checked}"
+            ) from exc
+
+        try:
+            elem.click()
+        except ElementClickInterceptedException as exc:
+            self.logger.info(
+                "Clique interceptado em '%s' (xpath #%d). Aguardando overlay/modal do SEI desaparecer.",
+                label,
+                idx,
+            )
+            if not self._wait_for_overlay_to_clear(timeout_seconds=min(6.0, float(self.timeout_seconds))):
+                self.logger.warning(
+                    "Overlay/modal do SEI permaneceu visivel ao clicar em '%s' (%s). Tentando fallback JS.",
+                    label,
+                    exc,
+                )
             try:
                 elem = self.wait_for_clickable(
                     xpath,
-                    tag=f"{label}_candidate_{idx}",
+                    tag=f"{label}_candidate_{idx}_retry",
                     timeout=candidate_timeout,
                 )
-                try:
-                    elem.click()
-                except ElementClickInterceptedException as exc:
-                    self.logger.info(
-                        "Clique interceptado em '%s' (xpath #%d). Aguardando overlay/modal do SEI desaparecer.",
-                        label,
-                        idx,
-                    )
-                    if not self._wait_for_overlay_to_clear(timeout_seconds=min(6.0, float(self.timeout_seconds))):
-                        self.logger.warning(
-                            "Overlay/modal do SEI permaneceu visivel ao clicar em '%s' (%s). Tentando fallback JS.",
-                            label,
-                            exc,
-                        )
-                    try:
-                        elem = self.wait_for_clickable(
-                            xpath,
-                            tag=f"{label}_candidate_{idx}_retry",
-                            timeout=candidate_timeout,
-                        )
-                        elem.click()
-                    except (ElementClickInterceptedException, WebDriverException):
-                        self.driver.execute_script("arguments[0].click();", elem)
-                return
-            except TimeoutException:
-                continue
+                elem.click()
+            except (ElementClickInterceptedException, WebDriverException):
+                self.driver.execute_script("arguments[0].click();", elem)
 
-        raise TimeoutException(
-            f"Nao localizei elemento clicavel para '{label}'. XPaths tentados: {checked}"
-        )
+    def _first_displayed_element(self, xpath: str) -> Any:
+        try:
+            for elem in self.driver.find_elements(By.XPATH, xpath):
+                if elem.is_displayed() and elem.is_enabled():
+                    return elem
+        except WebDriverException:
+            pass
+        return None
 
     # Toolbar do processo (ate abrir filtro)
     def _wait_page_ready_in_processo(self) -> None:
@@ -2124,8 +2404,8 @@ class SEIScraper:
 
         matched_terms: List[str] = []
         score = 0
-        for idx, term in enumerate(document_type.tree_match_terms):
-            normalized_term = self._normalize_text(term)
+        terms = document_type.tree_match_terms
+        for idx, (term, normalized_term) in enumerate(zip(terms, self._normalized_terms(terms))):
             if not normalized_term or normalized_term not in normalized:
                 continue
             matched_terms.append(term)
@@ -2171,6 +2451,12 @@ class SEIScraper:
 
         return (score, matched_terms)
 
+    def _switch_to_ifr_arvore(self) -> None:
+        # id e name numa unica consulta CSS; switch_to.frame("ifrArvore") faria ate duas buscas (id, depois name).
+        self.driver.switch_to.default_content()
+        iframe = self.driver.find_element(By.CSS_SELECTOR, IFR_ARVORE_CSS)
+        self.driver.switch_to.frame(iframe)
+
     def _find_document_candidates_in_tree(
         self,
         document_type: DocumentTypeSpec,
@@ -2181,9 +2467,7 @@ class SEIScraper:
             xpaths = self.selectors.get_many("processo.documentos_do_processo_links")
 
             try:
-                self.driver.switch_to.default_content()
-                iframe = self.driver.find_element(By.XPATH, "//iframe[@id='ifrArvore' or @name='ifrArvore']")
-                self.driver.switch_to.frame(iframe)
+                self._switch_to_ifr_arvore()
             except WebDriverException as exc:
                 self.logger.info(
                     "Fallback arvore %s: nao foi possivel entrar no ifrArvore (%s).",
@@ -2198,10 +2482,8 @@ class SEIScraper:
                     elems = self.driver.find_elements(By.XPATH, xpath)
                 except WebDriverException:
                     continue
-                for elem in elems:
-                    try:
-                        raw_text = (elem.text or "").strip()
-                    except WebDriverException:
+                for raw_text in get_elements_text(self.driver, elems):
+                    if not raw_text:
                         continue
                     normalized = self._normalize_text(raw_text)
                     score, matched_terms = self._score_tree_candidate(document_type, raw_text)
@@ -2274,9 +2556,7 @@ class SEIScraper:
 
         xpaths = self.selectors.get_many("processo.documentos_do_processo_links")
         try:
-            self.driver.switch_to.default_content()
-            iframe = self.driver.find_element(By.XPATH, "//iframe[@id='ifrArvore' or @name='ifrArvore']")
-            self.driver.switch_to.frame(iframe)
+            self._switch_to_ifr_arvore()
         except WebDriverException:
             return None
 
@@ -2285,12 +2565,8 @@ class SEIScraper:
                 elems = self.driver.find_elements(By.XPATH, xpath)
             except WebDriverException:
                 continue
-            for elem in elems:
-                try:
-                    raw_text = (elem.text or "").strip()
-                except WebDriverException:
-                    continue
-                if self._normalize_text(raw_text) == target_normalized:
+            for elem, raw_text in zip(elems, get_elements_text(self.driver, elems)):
+                if raw_text and self._normalize_text(raw_text) == target_normalized:
                     return elem
 
         try:
@@ -2341,8 +2617,34 @@ class SEIScraper:
                     )
                     return False
 
-            link = self._locate_tree_link_by_text(str(candidate.get("text", "")))
-            if link is None:
+            candidate_text = str(candidate.get("text", ""))
+
+            def click_tree_link(link: Any) -> bool:
+                if link is None:
+                    return False
+                try:
+                    self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", link)
+                except WebDriverException:
+                    pass
+                try:
+                    link.click()
+                except WebDriverException:
+                    self.driver.execute_script("arguments[0].click();", link)
+                return True
+
+            try:
+                # Arvore re-renderizada entre a busca e o clique: relocaliza o mesmo texto em vez de descartar o candidato.
+                clicked = retry_on_stale(lambda: self._locate_tree_link_by_text(candidate_text), click_tree_link)
+            except WebDriverException as exc:
+                self.logger.warning(
+                    "Processo %s: falha ao clicar no candidato #%d da arvore para %s (%s).",
+                    processo,
+                    attempt_index,
+                    document_type.log_label,
+                    exc,
+                )
+                continue
+            if not clicked:
                 self.logger.warning(
                     "Processo %s: candidato #%d da arvore para %s nao foi reencontrado (texto='%s').",
                     processo,
@@ -2352,26 +2654,6 @@ class SEIScraper:
                 )
                 continue
 
-            try:
-                self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", link)
-            except WebDriverException:
-                pass
-
-            try:
-                link.click()
-            except WebDriverException:
-                try:
-                    self.driver.execute_script("arguments[0].click();", link)
-                except WebDriverException as exc:
-                    self.logger.warning(
-                        "Processo %s: falha ao clicar no candidato #%d da arvore para %s (%s).",
-                        processo,
-                        attempt_index,
-                        document_type.log_label,
-                        exc,
-                    )
-                    continue
-
             try:
                 self.driver.switch_to.default_content()
             except WebDriverException:
@@ -3009,27 +3291,19 @@ class SEIScraper:
     def _normalize_text(self, value: str | None) -> str:
         if not value:
             return ""
-        fixed = value
-        if any(marker in fixed for marker in ("\u00C3", "\u00C2", "\uFFFD")):
-            try:
-                fixed = fixed.encode("latin1").decode("utf-8")
-            except UnicodeError:
-                fixed = value
+        return _normalize_text_cached(value)
 
-        collapsed = " ".join(fixed.split()).strip().upper()
-        deaccented = unicodedata.normalize("NFKD", collapsed)
-        return "".join(ch for ch in deaccented if not unicodedata.combining(ch))
+    def _normalized_terms(self, terms: Tuple[str, ...]) -> Tuple[str, ...]:
+        cached = _NORMALIZED_TERMS_CACHE.get(terms)
+        if cached is None:
+            cached = _NORMALIZED_TERMS_CACHE[terms] = tuple(self._normalize_text(term) for term in terms)
+        return cached
 
     def _parse_descricoes_busca(self, raw_value: str | None) -> List[str]:
         if not raw_value:
             return []
         return [part for part in (self._normalize_text(x) for x in raw_value.split("|")) if part]
 
-    def _descricao_match(self, descricao_normalizada: str, alvo_normalizado: str) -> bool:
-        if self.descricao_match_mode == "equals":
-            return descricao_normalizada == alvo_normalizado
-        return alvo_normalizado in descricao_normalizada
-
     def _resolve_internal_block_profile(self, descricao: str) -> InternalBlockProfile | None:
         descricao_normalizada = self._normalize_text(descricao)
         if not descricao_normalizada:
@@ -3039,8 +3313,7 @@ class SEIScraper:
             if not profile.enabled:
                 continue
 
-            for pattern in profile.description_patterns:
-                pattern_normalizado = self._normalize_text(pattern)
+            for pattern_normalizado in self._normalized_terms(profile.description_patterns):
                 if pattern_normalizado and pattern_normalizado in descricao_normalizada:
                     self.logger.debug(
                         "Resolved internal block profile '%s' for descricao='%s'.",
@@ -3054,15 +3327,11 @@ class SEIScraper:
 
     def _is_valid_descricao_candidate(self, text: str, numero_normalizado: str) -> bool:
         normalized = self._normalize_text(text)
-        if not normalized:
-            return False
-        if normalized == numero_normalizado:
-            return False
-        if normalized in {"GERADO", "RECEBIDO", "CONCLUIDO"}:
-            return False
-        if len(normalized) < 4:
-            return False
-        return True
+        return (
+            len(normalized) >= 4
+            and normalized not in INVALID_DESCRICAO_VALUES
+            and normalized != numero_normalizado
+        )
 
     def _extract_descricao_from_row(
         self,
@@ -3075,8 +3344,7 @@ class SEIScraper:
         except WebDriverException:
             desc_cells = []
 
-        for cell in desc_cells:
-            text = (cell.text or "").strip()
+        for text in get_elements_text(self.driver, desc_cells):
             if self._is_valid_descricao_candidate(text, numero_normalizado):
                 return text
 
@@ -3100,15 +3368,19 @@ class SEIScraper:
             if elems:
                 return elems
 
+            # Lista de iframes lida uma vez; so e relida se uma referencia ficar stale.
             iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
             for idx in range(len(iframes)):
                 try:
-                    self.driver.switch_to.default_content()
-                    current_iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-                    if idx >= len(current_iframes):
-                        continue
-
-                    self.driver.switch_to.frame(current_iframes[idx])
+                    if idx > 0:
+                        self.driver.switch_to.default_content()
+                    try:
+                        self.driver.switch_to.frame(iframes[idx])
+                    except StaleElementReferenceException:
+                        iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
+                        if idx >= len(iframes):
+                            break
+                        self.driver.switch_to.frame(iframes[idx])
                     frame_elems = self.driver.find_elements(By.XPATH, xpath)
                     if frame_elems:
                         return frame_elems
@@ -3129,6 +3401,32 @@ class SEIScraper:
         rows = self._find_elements_any_context(x_rows)
         return _build_rows_signature(rows)
 
+    def _read_interno_rows_js(
+        self,
+        rows: List[Any],
+        x_link_rel: str,
+        x_desc_rel: str,
+    ) -> Optional[List[Tuple[Any, str, List[str], List[str]]]]:
+        # Por linha: (link, texto do link, textos de x_desc_rel, textos de tds sem controles).
+        # None quando o driver nao executa JS ou o retorno nao bate; o chamador le linha a linha.
+        if not rows:
+            return []
+        try:
+            raw = self.driver.execute_script(INTERNO_ROWS_CALL_SCRIPT, list(rows), x_link_rel, x_desc_rel)
+            if raw == INTERNO_ROWS_MISSING:
+                raw = self.driver.execute_script(INTERNO_ROWS_INSTALL_SCRIPT, list(rows), x_link_rel, x_desc_rel)
+        except (AttributeError, WebDriverException):
+            return None
+        if not isinstance(raw, list) or len(raw) != len(rows):
+            return None
+        try:
+            return [
+                (item[0], str(item[1] or ""), [str(t or "") for t in item[2]], [str(t or "") for t in item[3]])
+                for item in raw
+            ]
+        except (IndexError, TypeError):
+            return None
+
     def _collect_interno_rows_current_page(self, page: int) -> List[InternoRow]:
         sel = self.selectors.get("interno", {})
         x_rows = sel.get("tabela_blocos_rows") or "//tr[td]"
@@ -3152,22 +3450,42 @@ class SEIScraper:
 
         internos: List[InternoRow] = []
         descricoes_vazias = 0
+        # Uma unica ida ao navegador traz link, numero e candidatos de descricao de todas as linhas.
+        batched_rows = self._read_interno_rows_js(rows, x_link_rel, x_desc_rel)
         for idx, row in enumerate(rows, start=1):
             try:
-                links = row.find_elements(By.XPATH, x_link_rel)
-                if not links:
-                    continue
+                if batched_rows is not None:
+                    link, link_text, desc_texts, plain_td_texts = batched_rows[idx - 1]
+                    if link is None:
+                        continue
+                    numero_raw = " ".join((link_text or "").split())
+                    numero = self._normalize_text(link_text)
+                    if not numero:
+                        continue
+                    descricao = next(
+                        (
+                            text
+                            for text in (*desc_texts, *plain_td_texts)
+                            if self._is_valid_descricao_candidate(text, numero)
+                        ),
+                        "",
+                    )
+                else:
+                    links = row.find_elements(By.XPATH, x_link_rel)
+                    if not links:
+                        continue
 
-                link = links[0]
-                numero = self._normalize_text(link.text)
-                if not numero:
-                    continue
+                    link = links[0]
+                    numero_raw = " ".join((link.text or "").split())
+                    numero = self._normalize_text(numero_raw)
+                    if not numero:
+                        continue
 
-                descricao = self._extract_descricao_from_row(
-                    row=row,
-                    numero_normalizado=numero,
-                    x_desc_rel=x_desc_rel,
-                )
+                    descricao = self._extract_descricao_from_row(
+                        row=row,
+                        numero_normalizado=numero,
+                        x_desc_rel=x_desc_rel,
+                    )
                 if not descricao:
                     descricoes_vazias += 1
 
@@ -3180,6 +3498,7 @@ class SEIScraper:
                         link=link,
                         page=page,
                         row_index=idx,
+                        numero_interno_raw=numero_raw,
                     )
                 )
             except StaleElementReferenceException:
@@ -3242,16 +3561,17 @@ class SEIScraper:
     def _collect_interno_rows_with_pagination(self, max_pages: int = 10) -> List[InternoRow]:
         seen: Set[tuple[str, str]] = set()
         collected: List[InternoRow] = []
+        seen_add = seen.add
+        collect = collected.append
         page = 1
         while page <= max_pages:
             try:
                 page_rows = self._collect_interno_rows_current_page(page=page)
                 for item in page_rows:
-                    signature = (item.numero_interno, item.descricao_normalizada)
-                    if signature in seen:
-                        continue
-                    seen.add(signature)
-                    collected.append(item)
+                    before = len(seen)
+                    seen_add((item.numero_interno, item.descricao_normalizada))
+                    if len(seen) != before:
+                        collect(item)
             finally:
                 try:
                     self.driver.switch_to.default_content()
@@ -3265,6 +3585,8 @@ class SEIScraper:
                 break
             page += 1
 
+        # Pagina em que a lista ficou apos a varredura; o primeiro clique guiado aproveita sem recarregar.
+        self._interno_list_shown_page = page
         self.logger.info("Total coletado na tabela de internos: %d", len(collected))
         return collected
 
@@ -3281,11 +3603,20 @@ class SEIScraper:
             self.logger.warning("Nenhum numero interno elegivel foi encontrado na tabela.")
             return []
 
-        matches_by_target: Dict[str, List[InternoRow]] = {target: [] for target in self.descricoes_busca}
-        for item in internos:
-            for target in self.descricoes_busca:
-                if self._descricao_match(item.descricao_normalizada, target):
-                    matches_by_target[target].append(item)
+        targets = self.descricoes_busca
+        matches_by_target: Dict[str, List[InternoRow]] = {target: [] for target in targets}
+        if self.descricao_match_mode == "equals":
+            # Modo equals: a propria descricao e a chave do dicionario de alvos, sem varrer a lista.
+            for item in internos:
+                bucket = matches_by_target.get(item.descricao_normalizada)
+                if bucket is not None:
+                    bucket.append(item)
+        else:
+            for item in internos:
+                descricao = item.descricao_normalizada
+                for target in targets:
+                    if target in descricao:
+                        matches_by_target[target].append(item)
 
         total_matches = 0
         for target in self.descricoes_busca:
@@ -3300,13 +3631,14 @@ class SEIScraper:
 
         selected_items: List[Tuple[InternoRow, str, str]] = []
         seen: Set[Tuple[str, str]] = set()
+        seen_add = seen.add
+        select = selected_items.append
         for target in self.descricoes_busca:
             for item in matches_by_target[target]:
-                signature = (item.numero_interno, item.descricao_normalizada)
-                if signature in seen:
-                    continue
-                seen.add(signature)
-                selected_items.append((item, target, list_url))
+                before = len(seen)
+                seen_add((item.numero_interno, item.descricao_normalizada))
+                if len(seen) != before:
+                    select((item, target, list_url))
 
         if not selected_items:
             self.logger.warning("Houve match contabilizado, mas nenhum item selecionavel.")
@@ -3320,14 +3652,21 @@ class SEIScraper:
         selected_target: str,
         list_url: str,
     ) -> bool:
-        try:
-            self.driver.get(list_url)
-            self._wait_for_document_ready(self.timeout_seconds, "reload_lista_internos")
-        except WebDriverException as exc:
-            self.logger.error("Falha ao recarregar lista de internos para clique guiado: %s", exc)
-            return False
+        shown_page = getattr(self, "_interno_list_shown_page", None)
+        # Qualquer clique guiado sai da lista; a partir daqui a proxima selecao precisa recarregar.
+        self._interno_list_shown_page = None
+        if shown_page is not None and shown_page <= selected.page:
+            current_page = shown_page
+            self.logger.info("Lista de internos ainda aberta na pagina %d; dispensando recarga.", shown_page)
+        else:
+            try:
+                self.driver.get(list_url)
+                self._wait_for_document_ready(self.timeout_seconds, "reload_lista_internos")
+            except WebDriverException as exc:
+                self.logger.error("Falha ao recarregar lista de internos para clique guiado: %s", exc)
+                return False
+            current_page = 1
 
-        current_page = 1
         while current_page < selected.page:
             if not self._click_next_page_if_available(page=current_page):
                 self.logger.error(
@@ -3338,23 +3677,40 @@ class SEIScraper:
                 return False
             current_page += 1
 
+        def locate_link() -> Any:
+            link = self._locate_selected_interno_link_by_row(selected)
+            if link is None:
+                link = self._locate_selected_interno_link_by_text(selected)
+            if link is None:
+                page_rows = self._collect_interno_rows_current_page(page=selected.page)
+                link = next(
+                    (
+                        item.link
+                        for item in page_rows
+                        if item.numero_interno == selected.numero_interno
+                        and item.descricao_normalizada == selected.descricao_normalizada
+                    ),
+                    None,
+                )
+            return link
+
+        def click_link(link: Any) -> bool:
+            if link is None:
+                return False
+            link.click()
+            return True
+
         try:
-            page_rows = self._collect_interno_rows_current_page(page=selected.page)
-            for item in page_rows:
-                if (
-                    item.numero_interno == selected.numero_interno
-                    and item.descricao_normalizada == selected.descricao_normalizada
-                ):
-                    item.link.click()
-                    self.logger.info(
-                        "Numero interno clicado: %s | descricao='%s' | criterio='%s' | pagina=%d linha=%d",
-                        selected.numero_interno,
-                        selected.descricao,
-                        selected_target,
-                        selected.page,
-                        selected.row_index,
-                    )
-                    return True
+            if retry_on_stale(locate_link, click_link):
+                self.logger.info(
+                    "Numero interno clicado: %s | descricao='%s' | criterio='%s' | pagina=%d linha=%d",
+                    selected.numero_interno,
+                    selected.descricao,
+                    selected_target,
+                    selected.page,
+                    selected.row_index,
+                )
+                return True
         except (StaleElementReferenceException, WebDriverException) as exc:
             self.logger.error("Falha ao executar clique guiado no numero interno: %s", exc)
             return False
@@ -3372,6 +3728,47 @@ class SEIScraper:
         )
         return False
 
+    def _locate_selected_interno_link_by_row(self, selected: InternoRow) -> Optional[Any]:
+        # Relocaliza so a linha ja conhecida, sem reextrair numero/descricao de todas as linhas da pagina.
+        sel = self.selectors.get("interno", {})
+        x_rows = sel.get("tabela_blocos_rows") or "//tr[td]"
+        x_link_rel = sel.get("numero_interno_link") or ".//a[contains(@class,'ancoraBlocoAberto')]"
+        try:
+            rows = self.wait_for_elements(
+                x_rows,
+                tag=f"tabela_blocos_rows_page_{selected.page}",
+                timeout=max(4, min(8, self.timeout_seconds)),
+                restore_context=False,
+            )
+        except TimeoutException:
+            return None
+        if not 0 < selected.row_index <= len(rows):
+            return None
+
+        try:
+            links = rows[selected.row_index - 1].find_elements(By.XPATH, x_link_rel)
+            if not links or self._normalize_text(links[0].text) != selected.numero_interno:
+                return None
+        except StaleElementReferenceException:
+            return None
+        return links[0]
+
+    def _locate_selected_interno_link_by_text(self, selected: InternoRow) -> Optional[Any]:
+        # O texto do numero vai no proprio XPath: o driver devolve so o link procurado, sem enumerar linhas.
+        sel = self.selectors.get("interno", {})
+        x_rows = sel.get("tabela_blocos_rows") or "//tr[td]"
+        x_link_rel = sel.get("numero_interno_link") or ".//a[contains(@class,'ancoraBlocoAberto')]"
+        # Compara com o texto exibido: numero_interno e a forma normalizada (maiusculas, sem acento).
+        if not selected.numero_interno_raw or not x_link_rel.startswith("./"):
+            return None
+        xpath = f"({x_rows}){x_link_rel[1:]}[normalize-space()={xpath_text_literal(selected.numero_interno_raw)}]"
+        try:
+            links = self.driver.find_elements(By.XPATH, xpath)
+        except WebDriverException:
+            return None
+        # Numero repetido na pagina (descricoes diferentes): deixa a desambiguacao para a varredura completa.
+        return links[0] if len(links) == 1 else None
+
     def _get_current_interno_descricao_value(self) -> str:
         contexts_to_try: List[tuple[str, Any]] = [("default", None)]
         try:
@@ -3614,7 +4011,7 @@ class SEIScraper:
         if not tds:
             return None
 
-        cell_texts = [(td.text or "").strip() for td in tds]
+        cell_texts = get_elements_text(self.driver, tds)
 
         processo = ""
         for selector in ("a.protocoloFechado", "a[class*='protocoloFechado']", "a"):
@@ -3622,11 +4019,7 @@ class SEIScraper:
                 links = row.find_elements(By.CSS_SELECTOR, selector)
             except WebDriverException:
                 links = []
-            for link in links:
-                text = (link.text or "").strip()
-                if text:
-                    processo = text
-                    break
+            processo = next((text for text in get_elements_text(self.driver, links) if text), "")
             if processo:
                 break
 
@@ -3687,6 +4080,8 @@ class SEIScraper:
         all_records: List[Dict[str, str]] = []
         seen_rows: Set[Tuple[str, str, str]] = set()
         seen_pages: Set[Tuple[str, int]] = set()
+        seen_rows_add = seen_rows.add
+        append_record = all_records.append
         page = 1
         max_pages = 100
 
@@ -3705,11 +4100,11 @@ class SEIScraper:
             seen_pages.add(page_signature)
 
             for record in page_records:
-                row_key = (record.get("seq", ""), record.get("processo", ""), record.get("numero_act", ""))
-                if row_key in seen_rows:
-                    continue
-                seen_rows.add(row_key)
-                all_records.append(record)
+                # Tuplas nao guardam o hash; add + comparacao de tamanho faz um unico hash por linha.
+                before = len(seen_rows)
+                seen_rows_add((record.get("seq", ""), record.get("processo", ""), record.get("numero_act", "")))
+                if len(seen_rows) != before:
+                    append_record(record)
 
             if not self._click_next_page_if_available(page=page):
                 break
@@ -4151,13 +4546,14 @@ class SEIScraper:
         if not x:
             raise RuntimeError("Seletor interno.processo ausente em xpath_selector.json")
 
+        # Caminho rapido: lista ja renderizada no documento principal, lida em um unico execute_script.
+        self.driver.switch_to.default_content()
+        texts = get_texts_by_xpath(self.driver, x, skip_empty=True)
+        if texts:
+            return texts
+
         elems = self.wait_for_elements(x, tag="list_processos")
-        out: List[str] = []
-        for elem in elems:
-            text = elem.text.strip() if elem.text else ""
-            if text:
-                out.append(text)
-        return out
+        return [text for text in get_elements_text(self.driver, elems) if text]
 
     def _open_processo(self, processo_text: str) -> None:
         self._switch_to_main_window_context()
@@ -4196,11 +4592,17 @@ class SEIScraper:
             return
 
         try:
-            handles = list(self.driver.window_handles)
-            if self.main_window_handle in handles:
-                self.driver.switch_to.window(self.main_window_handle)
-                return
+            # Caso comum: a aba da lista continua aberta; troca direto sem listar os handles antes.
+            self.driver.switch_to.window(self.main_window_handle)
+            return
+        except NoSuchWindowException:
+            pass
+        except WebDriverException as exc:
+            self.logger.warning("Falha ao alternar para janela principal: %s", exc)
+            return
 
+        try:
+            handles = list(self.driver.window_handles)
             if handles:
                 self.main_window_handle = handles[0]
                 self.driver.switch_to.window(self.main_window_handle)
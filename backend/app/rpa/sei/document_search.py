@@ -16,11 +16,14 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 from app.rpa.performance_profiler import count_target_event, profiler_sleep, target_span
 from app.rpa.selenium_utils import (
+    RENDERED_TEXT_JS,
     UIContextHint,
     clear_ui_context_hint,
+    get_elements_text,
     get_ui_context_hint,
     remember_ui_context_hint,
     switch_to_ui_context_hint,
+    xpath_text_literal,
 )
 from app.rpa.selectors import XPathSelectors
 
@@ -106,15 +109,6 @@ def _norm(text: str) -> str:
     return re.sub(r"\s+", " ", (text or "").strip())
 
 
-def _xpath_text_literal(value: str) -> str:
-    if "'" not in value:
-        return f"'{value}'"
-    if '"' not in value:
-        return f'"{value}"'
-    parts = value.split("'")
-    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
-
-
 def _find_elements_in_current_context(
     driver: Any,
     xpath: str,
@@ -1182,7 +1176,7 @@ def _build_tipo_xpath(template: str, tipo_exato: str) -> str:
     placeholder = "{TIPO_EXATO}"
     if placeholder not in template:
         return template
-    return template.replace(placeholder, _xpath_text_literal(tipo_exato))
+    return template.replace(placeholder, xpath_text_literal(tipo_exato))
 
 
 def _find_tipo_option_case_insensitive(
@@ -1201,9 +1195,8 @@ def _find_tipo_option_case_insensitive(
     alvo = _norm(tipo_exato).casefold()
     for container in containers:
         spans = container.find_elements(By.XPATH, ".//li//span[normalize-space(.)!='']")
-        for span in spans:
-            texto = _norm(span.text).casefold()
-            if texto != alvo:
+        for span, texto in zip(spans, get_elements_text(driver, spans)):
+            if _norm(texto).casefold() != alvo:
                 continue
 
             li_nodes = span.find_elements(By.XPATH, "./ancestor::li[1]")
@@ -1380,16 +1373,43 @@ def _get_primeiro_resultado(
     )
 
 
-def _dedupe_links(links: list[Any]) -> list[Any]:
-    deduped: list[Any] = []
-    seen: set[tuple[str, str]] = set()
+_LINK_KEYS_SCRIPT = (
+    RENDERED_TEXT_JS
+    + "return Array.prototype.map.call(arguments[0], function(a) {"
+    "  return [renderedText(a), (a.href || a.getAttribute('href') || '')];"
+    "});"
+)
+
+
+def _read_link_keys(driver: Any, links: list[Any]) -> list[tuple[str, str]]:
+    # Texto + href de todos os links em um unico execute_script; fallback le link a link.
+    try:
+        raw = driver.execute_script(_LINK_KEYS_SCRIPT, list(links))
+    except (AttributeError, WebDriverException):
+        raw = None
+    if isinstance(raw, list) and len(raw) == len(links):
+        try:
+            return [(_norm(str(text or "")), str(href or "").strip()) for text, href in raw]
+        except (TypeError, ValueError):
+            pass
+
+    keys: list[tuple[str, str]] = []
     for link in links:
         try:
             text = _norm(link.text)
         except WebDriverException:
             text = ""
-        href = _safe_get_attribute(link, "href")
-        key = (text, href)
+        keys.append((text, _safe_get_attribute(link, "href")))
+    return keys
+
+
+def _dedupe_links(driver: Any, links: list[Any]) -> list[Any]:
+    deduped: list[Any] = []
+    seen: set[tuple[str, str]] = set()
+    if not links:
+        return deduped
+    for link, key in zip(links, _read_link_keys(driver, links)):
+        text, href = key
         if not text and not href:
             continue
         if key in seen:
@@ -1425,12 +1445,12 @@ def _collect_immediate_result_links(
                 links = []
             if links:
                 row_links.append(links[0])
-        deduped = _dedupe_links(row_links)
+        deduped = _dedupe_links(driver, row_links)
         if deduped:
             return deduped
 
     for xpath in generic_link_xpaths:
-        deduped = _dedupe_links(_find_elements_immediate_in_current_context(driver, xpath))
+        deduped = _dedupe_links(driver, _find_elements_immediate_in_current_context(driver, xpath))
         if deduped:
             return deduped
 
@@ -24,6 +24,7 @@ SNAPSHOT_EARLY_FALLBACK_TEXT_THRESHOLD = 120
 MANAGED_DOWNLOAD_WAIT_SECONDS = 6.0
 MANAGED_DOWNLOAD_POLL_SECONDS = 0.2
 MANAGED_DOWNLOAD_STABLE_POLLS = 2
+IFR_VISUALIZACAO_CSS = "iframe#ifrVisualizacao, iframe[name='ifrVisualizacao']"
 
 
 def _log(logger: Any, level: str, msg: str, *args: Any) -> None:
@@ -154,8 +155,7 @@ def get_visualizacao_iframe(
         pass
 
     try:
-        direct_xpath = "//iframe[@id='ifrVisualizacao' or @name='ifrVisualizacao']"
-        direct_matches = driver.find_elements(By.XPATH, direct_xpath)
+        direct_matches = driver.find_elements(By.CSS_SELECTOR, IFR_VISUALIZACAO_CSS)
         if direct_matches:
             _log(
                 logger,
@@ -253,7 +253,7 @@ def _switch_to_visualizacao_iframe_once(
                 deadline_inner = time.time() + 2.5
                 inner_candidates: List[Any] = []
                 while time.time() < deadline_inner:
-                    inner_candidates = driver.find_elements(By.XPATH, "//iframe[@id='ifrVisualizacao' or @name='ifrVisualizacao']")
+                    inner_candidates = driver.find_elements(By.CSS_SELECTOR, IFR_VISUALIZACAO_CSS)
                     if not inner_candidates:
                         inner_candidates = driver.find_elements(
                             By.XPATH,
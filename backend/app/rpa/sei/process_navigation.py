@@ -5,9 +5,12 @@ from typing import Any, Optional
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 
+from app.rpa.selenium_utils import click_xpath_by_text, retry_on_stale, xpath_text_literal
 from app.rpa.selenium_utils import log_iframe_hint as selenium_log_iframe_hint
 from app.rpa.selenium_utils import wait_for_elements as selenium_wait_for_elements
 
+NEW_WINDOW_WAIT_POLL_SECONDS = 0.1
+
 
 def open_processo(driver: Any, processo_text: str, selectors: Any, logger: Any) -> tuple[str, str, str]:
     sel = selectors.get("interno", {})
@@ -16,52 +19,68 @@ def open_processo(driver: Any, processo_text: str, selectors: Any, logger: Any)
         raise RuntimeError("Seletor interno.processo ausente em xpath_selector.json")
 
     timeout_seconds = getattr(driver, "_sei_timeout_seconds", 10)
-    elems = selenium_wait_for_elements(
-        driver,
-        logger,
-        x,
-        "open_processo_list",
-        timeout_seconds=timeout_seconds,
-        restore_context=True,
-    )
-    for elem in elems:
-        if (elem.text or "").strip() == processo_text:
-            handles_before = set(driver.window_handles)
-            elem.click()
-
-            try:
-                WebDriverWait(driver, timeout_seconds).until(
-                    lambda d: len(set(d.window_handles) - handles_before) > 0
-                )
-            except TimeoutException as exc:
-                frames = selenium_log_iframe_hint(driver, logger, "Timeout aguardando nova janela do processo")
-                logger.error("Contexto: iframe_count=%d url=%s", len(frames), driver.current_url)
-                raise RuntimeError(
-                    f"Nao abriu nova janela para o processo: {processo_text}"
-                ) from exc
-
-            handles_after = set(driver.window_handles)
-            new_handles = list(handles_after - handles_before)
-            if not new_handles:
-                raise RuntimeError(
-                    f"Nao identifiquei o handle da nova janela do processo: {processo_text}"
-                )
 
-            new_handle = new_handles[0]
-            driver.switch_to.window(new_handle)
-            url = driver.current_url
-            title = driver.title
-            logger.info(
-                "Nova janela do processo aberta. handle=%s url=%s title=%s",
-                new_handle,
-                url,
-                title,
-            )
-            return new_handle, url, title
+    # Caminho rapido: localiza e clica no processo em um unico execute_script.
+    driver.switch_to.default_content()
+    handles_before = set(driver.window_handles)
+    if click_xpath_by_text(driver, x, processo_text):
+        return _switch_to_new_processo_window(driver, handles_before, processo_text, timeout_seconds, logger)
 
-    frames = selenium_log_iframe_hint(driver, logger, "Nao consegui localizar o processo para abrir")
-    logger.error("Contexto: iframe_count=%d url=%s", len(frames), driver.current_url)
-    raise RuntimeError(f"Nao consegui abrir o processo: {processo_text}")
+    # Fallback: o proprio XPath filtra pelo texto, sem ler o .text de cada item da lista.
+    x_processo = f"({x})[normalize-space()={xpath_text_literal(processo_text)}]"
+    handles_before = set(driver.window_handles)
+    try:
+        retry_on_stale(
+            lambda: selenium_wait_for_elements(
+                driver,
+                logger,
+                x_processo,
+                "open_processo_list",
+                timeout_seconds=timeout_seconds,
+                restore_context=True,
+            )[0],
+            lambda elem: elem.click(),
+        )
+    except (TimeoutException, IndexError) as exc:
+        frames = selenium_log_iframe_hint(driver, logger, "Nao consegui localizar o processo para abrir")
+        logger.error("Contexto: iframe_count=%d url=%s", len(frames), driver.current_url)
+        raise RuntimeError(f"Nao consegui abrir o processo: {processo_text}") from exc
+    return _switch_to_new_processo_window(driver, handles_before, processo_text, timeout_seconds, logger)
+
+
+def _switch_to_new_processo_window(
+    driver: Any,
+    handles_before: set[str],
+    processo_text: str,
+    timeout_seconds: float,
+    logger: Any,
+) -> tuple[str, str, str]:
+    try:
+        # A condicao devolve o novo handle assim que ele aparece, sem reler window_handles depois.
+        new_handle = WebDriverWait(
+            driver,
+            timeout_seconds,
+            poll_frequency=NEW_WINDOW_WAIT_POLL_SECONDS,
+        ).until(
+            lambda d: next((h for h in d.window_handles if h not in handles_before), False)
+        )
+    except TimeoutException as exc:
+        frames = selenium_log_iframe_hint(driver, logger, "Timeout aguardando nova janela do processo")
+        logger.error("Contexto: iframe_count=%d url=%s", len(frames), driver.current_url)
+        raise RuntimeError(
+            f"Nao abriu nova janela para o processo: {processo_text}"
+        ) from exc
+
+    driver.switch_to.window(new_handle)
+    url = driver.current_url
+    title = driver.title
+    logger.info(
+        "Nova janela do processo aberta. handle=%s url=%s title=%s",
+        new_handle,
+        url,
+        title,
+    )
+    return new_handle, url, title
 
 
 def close_current_tab_and_back(
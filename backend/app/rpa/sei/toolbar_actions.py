@@ -10,7 +10,6 @@ from selenium.common.exceptions import (
     WebDriverException,
 )
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 
 from app.rpa.performance_profiler import profiler_sleep, target_span
 from app.rpa.selenium_utils import (
@@ -18,6 +17,7 @@ from app.rpa.selenium_utils import (
     clear_ui_context_hint,
     click_xpath_with_retry,
     get_ui_context_hint,
+    get_wait,
     remember_ui_context_hint,
     switch_to_ui_context_hint,
 )
@@ -26,6 +26,7 @@ from app.rpa.selenium_utils import (
 UI_HINT_ABRIR_PASTAS = "processo.abrir_todas_as_pastas"
 UI_HINT_PESQUISAR_PROCESSO = "processo.pesquisar_no_processo"
 UI_HINT_PESQUISA_ANCHOR = "processo.pesquisa_anchor"
+PESQUISA_ANCHOR_POLL_SECONDS = 0.2
 
 
 def _resolve_timeout(driver: Any, timeout: int | float | None) -> float:
@@ -40,6 +41,14 @@ def _resolve_probe_timeout(driver: Any, timeout: int | float | None) -> float:
     return max(10.0, min(20.0, _resolve_timeout(driver, None)))
 
 
+def _resolve_poll_seconds(driver: Any, default: float) -> float:
+    # Mesmo intervalo configurado para os WebDriverWait (WAIT_POLL_MS), quando o scraper o definiu.
+    poll_seconds = getattr(driver, "_sei_wait_poll_seconds", None)
+    if not isinstance(poll_seconds, (int, float)) or poll_seconds <= 0:
+        return default
+    return min(float(poll_seconds), default)
+
+
 def _get_selector_candidates(selectors: Any, path: str) -> List[str]:
     candidates = selectors.get_many(path)
     return [str(xpath) for xpath in candidates if str(xpath).strip()]
@@ -101,9 +110,8 @@ def wait_page_ready_in_processo(driver: Any, logger: Any, timeout: int | float |
     except WebDriverException:
         pass
 
-    WebDriverWait(driver, timeout_seconds).until(
-        lambda d: d.execute_script("return document.readyState") == "complete"
-    )
+    wait = get_wait(driver, timeout_seconds)
+    wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
 
     def _toolbar_or_frame_ready(current_driver: Any) -> bool:
         try:
@@ -129,7 +137,7 @@ def wait_page_ready_in_processo(driver: Any, logger: Any, timeout: int | float |
 
         return False
 
-    WebDriverWait(driver, timeout_seconds).until(_toolbar_or_frame_ready)
+    wait.until(_toolbar_or_frame_ready)
 
 
 def click_abrir_todas_as_pastas(
@@ -670,6 +678,11 @@ def wait_pesquisa_anchor(
             finally:
                 _safe_default()
 
-        profiler_sleep(0.2)
+        profiler_sleep(
+            min(
+                _resolve_poll_seconds(driver, PESQUISA_ANCHOR_POLL_SECONDS),
+                max(0.0, deadline - time.time()),
+            )
+        )
 
     raise RuntimeError("Tela de filtro/pesquisa nao confirmou abertura (anchor/url)")
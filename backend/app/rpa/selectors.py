@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from difflib import get_close_matches
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -15,6 +16,13 @@ class SelectorNotFoundError(KeyError):
 class XPathSelectors:
     _data: Dict[str, Any]
     source_path: Path
+    # Todos os caminhos pontuados resolvidos uma vez no load: "a.b.c" -> valor.
+    _flat: Dict[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        flat: Dict[str, Any] = {}
+        self._flatten(self._data, prefix="", out=flat)
+        object.__setattr__(self, "_flat", flat)
 
     @classmethod
     def from_file(cls, path: Path | None = None) -> "XPathSelectors":
@@ -40,6 +48,11 @@ class XPathSelectors:
             return default
 
     def require(self, path: str) -> Any:
+        try:
+            return self._flat[path]
+        except (KeyError, TypeError):
+            pass
+
         if not path or not isinstance(path, str):
             raise ValueError("O caminho do seletor deve ser uma string nao vazia")
 
@@ -72,16 +85,14 @@ class XPathSelectors:
         )
 
     def available_paths(self) -> List[str]:
-        paths: List[str] = []
-        self._collect_paths(self._data, prefix="", out=paths)
-        return sorted(paths)
+        return sorted(self._flat)
 
-    def _collect_paths(self, node: Any, prefix: str, out: List[str]) -> None:
+    def _flatten(self, node: Any, prefix: str, out: Dict[str, Any]) -> None:
         if isinstance(node, dict):
             for key, value in node.items():
                 current = f"{prefix}.{key}" if prefix else key
-                out.append(current)
-                self._collect_paths(value, current, out)
+                out[current] = value
+                self._flatten(value, current, out)
 
     def _build_missing_message(
         self,
@@ -124,5 +135,6 @@ class XPathSelectors:
         return suffix_matches[:5]
 
 
+@lru_cache(maxsize=1)
 def load_xpath_selectors() -> XPathSelectors:
     return XPathSelectors.from_file()
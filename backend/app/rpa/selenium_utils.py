@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from selenium.common.exceptions import (
     ElementClickInterceptedException,
@@ -19,6 +20,10 @@ from app.rpa.performance_profiler import profiler_sleep
 
 ELEMENT_LOOKUP_POLL_SECONDS = 0.25
 CLICK_RETRY_POLL_SECONDS = 0.15
+STALE_RETRY_BASE_DELAY_SECONDS = 0.1
+# Mesmo default do Selenium; SEIScraper aplica WAIT_POLL_MS via driver._sei_wait_poll_seconds.
+DEFAULT_WAIT_POLL_SECONDS = 0.5
+FRAME_SEARCH_MAX_DEPTH = 3
 
 
 @dataclass(frozen=True)
@@ -67,6 +72,21 @@ def clear_ui_context_hint(driver: Any, key: str) -> None:
     _ui_context_store(driver).pop(key, None)
 
 
+def get_wait(driver: Any, timeout_seconds: float) -> WebDriverWait:
+    # WebDriverWait nao guarda estado entre until(); uma instancia por timeout basta para o driver.
+    waits = getattr(driver, "_sei_waits", None)
+    if not isinstance(waits, dict):
+        waits = {}
+        setattr(driver, "_sei_waits", waits)
+    wait = waits.get(timeout_seconds)
+    if wait is None:
+        poll_seconds = getattr(driver, "_sei_wait_poll_seconds", None)
+        if not isinstance(poll_seconds, (int, float)) or poll_seconds <= 0:
+            poll_seconds = DEFAULT_WAIT_POLL_SECONDS
+        wait = waits[timeout_seconds] = WebDriverWait(driver, timeout_seconds, poll_frequency=poll_seconds)
+    return wait
+
+
 def _find_frame_in_current_context(
     driver: Any,
     *,
@@ -136,7 +156,22 @@ def switch_to_ui_context_hint(driver: Any, hint: UIContextHint) -> bool:
     return True
 
 
+_IFRAMES_INFO_SCRIPT = (
+    "return Array.prototype.map.call(document.querySelectorAll('iframe'), function(f, i) {"
+    "  return {index: i, id: f.getAttribute('id'), name: f.getAttribute('name'), src: f.getAttribute('src')};"
+    "});"
+)
+
+
 def get_iframes_info(driver: Any) -> List[Dict[str, Any]]:
+    # Um unico execute_script traz id/name/src de todos os iframes; o laco abaixo e so fallback.
+    try:
+        batched = driver.execute_script(_IFRAMES_INFO_SCRIPT)
+    except (AttributeError, WebDriverException):
+        batched = None
+    if isinstance(batched, list) and all(isinstance(item, dict) for item in batched):
+        return batched
+
     frames: List[Dict[str, Any]] = []
     try:
         elems = driver.find_elements(By.TAG_NAME, "iframe")
@@ -165,6 +200,87 @@ def get_iframes_info(driver: Any) -> List[Dict[str, Any]]:
     return frames
 
 
+# Equivalente em JS do WebElement.text: elemento sem caixa renderizada (display:none, fora do layout)
+# devolve "", em vez do textContent escondido que o innerText retornaria nesse caso.
+RENDERED_TEXT_JS = "const renderedText = (n) => (n && n.getClientRects().length) ? (n.innerText || '').trim() : '';"
+
+_ELEMENTS_TEXT_SCRIPT = (
+    RENDERED_TEXT_JS
+    + "return Array.prototype.map.call(arguments[0], renderedText);"
+)
+
+
+def get_elements_text(driver: Any, elems: List[Any]) -> List[str]:
+    if not elems:
+        return []
+    try:
+        texts = driver.execute_script(_ELEMENTS_TEXT_SCRIPT, list(elems))
+    except (AttributeError, WebDriverException):
+        texts = None
+    if isinstance(texts, list) and len(texts) == len(elems):
+        return [str(text or "").strip() for text in texts]
+
+    out: List[str] = []
+    for elem in elems:
+        try:
+            out.append((elem.text or "").strip())
+        except WebDriverException:
+            out.append("")
+    return out
+
+
+_XPATH_TEXTS_SCRIPT = (
+    RENDERED_TEXT_JS
+    + "const r = document.evaluate(arguments[0], document, null, "
+    "XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);"
+    "const out = [];"
+    "for (let i = 0; i < r.snapshotLength; i++) {"
+    "  const n = r.snapshotItem(i);"
+    "  const t = renderedText(n);"
+    "  if (t || !arguments[1]) { out.push(t); }"
+    "}"
+    "return out;"
+)
+
+
+def get_texts_by_xpath(driver: Any, xpath: str, *, skip_empty: bool = False) -> List[str]:
+    try:
+        texts = driver.execute_script(_XPATH_TEXTS_SCRIPT, xpath, skip_empty)
+    except (AttributeError, WebDriverException):
+        return []
+    if not isinstance(texts, list):
+        return []
+    return [str(text or "") for text in texts]
+
+
+_CLICK_BY_TEXT_SCRIPT = (
+    RENDERED_TEXT_JS
+    + "const r = document.evaluate(arguments[0], document, null, "
+    "XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);"
+    "for (let i = 0; i < r.snapshotLength; i++) {"
+    "  const n = r.snapshotItem(i);"
+    "  if (renderedText(n) === arguments[1]) { n.click(); return true; }"
+    "}"
+    "return false;"
+)
+
+
+def click_xpath_by_text(driver: Any, xpath: str, text: str) -> bool:
+    try:
+        return bool(driver.execute_script(_CLICK_BY_TEXT_SCRIPT, xpath, text))
+    except (AttributeError, WebDriverException):
+        return False
+
+
+def xpath_text_literal(value: str) -> str:
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
 def get_ready_state(driver: Any) -> str:
     try:
         value = driver.execute_script("return document.readyState")
@@ -175,7 +291,7 @@ def get_ready_state(driver: Any) -> str:
 
 def wait_for_document_ready(driver: Any, timeout: int, tag: str, logger: Any) -> None:
     try:
-        WebDriverWait(driver, timeout).until(
+        get_wait(driver, timeout).until(
             lambda d: d.execute_script("return document.readyState") == "complete"
         )
     except TimeoutException as exc:
@@ -194,6 +310,61 @@ def log_iframe_hint(driver: Any, logger: Any, context: str) -> List[Dict[str, An
     return frames
 
 
+_FRAME_BY_XPATH_SCRIPT = (
+    "const xpath = arguments[0], maxDepth = arguments[1];"
+    "let blocked = 0;"
+    "function search(doc, depth) {"
+    "  const frames = doc.querySelectorAll('iframe');"
+    "  for (let i = 0; i < frames.length; i++) {"
+    "    let d = null;"
+    "    try { d = frames[i].contentDocument; } catch (e) { d = null; }"
+    "    if (!d) { if (depth === 0) { blocked++; } continue; }"
+    "    try {"
+    "      if (d.evaluate(xpath, d, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue) {"
+    "        return [i];"
+    "      }"
+    "    } catch (e) { if (depth === 0) { blocked++; } continue; }"
+    "    if (depth + 1 < maxDepth) {"
+    "      const sub = search(d, depth + 1);"
+    "      if (sub) { return [i].concat(sub); }"
+    "    }"
+    "  }"
+    "  return null;"
+    "}"
+    "const path = search(document, 0);"
+    "if (!path) { return [null, [], blocked]; }"
+    "return [document.querySelectorAll('iframe')[path[0]], path.slice(1), blocked];"
+)
+
+
+def _find_frame_by_xpath_js(driver: Any, xpath: str) -> Optional[Tuple[Any, List[int], int]]:
+    # (iframe de topo, indices dos iframes aninhados ate o alvo, qtd. de iframes de topo
+    # nao inspecionaveis); None = driver sem JS, segue pelo laco de troca de contexto.
+    try:
+        result = driver.execute_script(_FRAME_BY_XPATH_SCRIPT, xpath, FRAME_SEARCH_MAX_DEPTH)
+    except (AttributeError, WebDriverException):
+        return None
+    if not isinstance(result, list) or len(result) != 3:
+        return None
+    try:
+        return result[0], [int(idx) for idx in (result[1] or [])], int(result[2] or 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _switch_to_frame_path(driver: Any, top_frame: Any, nested_path: List[int]) -> None:
+    driver.switch_to.frame(top_frame)
+    for idx in nested_path:
+        driver.switch_to.frame(driver.find_elements(By.TAG_NAME, "iframe")[idx])
+
+
+def _is_debug_enabled(logger: Any) -> bool:
+    try:
+        return bool(logger.isEnabledFor(logging.DEBUG))
+    except AttributeError:
+        return True
+
+
 def wait_for_elements(
     driver: Any,
     logger: Any,
@@ -202,17 +373,52 @@ def wait_for_elements(
     timeout_seconds: int,
     restore_context: bool = True,
 ) -> List[Any]:
-    wait_for_document_ready(driver, timeout_seconds, tag, logger)
-    deadline = time.time() + timeout_seconds
     iframe_count_logged = False
+    # Contexto conhecido apos o primeiro default_content: evita voltar ao topo sem necessidade.
+    in_frame = True
 
     try:
+        # Caminho quente: se o XPath ja resolve no documento principal, dispensa o readyState.
+        driver.switch_to.default_content()
+        in_frame = False
+        elems = driver.find_elements(By.XPATH, xpath)
+        if elems:
+            return elems
+
+        wait_for_document_ready(driver, timeout_seconds, tag, logger)
+        deadline = time.time() + timeout_seconds
+        use_js_frame_search = True
+        log_frame_attrs = _is_debug_enabled(logger)
         while time.time() < deadline:
-            driver.switch_to.default_content()
+            if in_frame:
+                driver.switch_to.default_content()
+                in_frame = False
             elems = driver.find_elements(By.XPATH, xpath)
             if elems:
                 return elems
 
+            if use_js_frame_search:
+                found = _find_frame_by_xpath_js(driver, xpath)
+                if found is None:
+                    use_js_frame_search = False
+                else:
+                    frame, nested_path, blocked = found
+                    if frame is not None:
+                        try:
+                            in_frame = True
+                            _switch_to_frame_path(driver, frame, nested_path)
+                            elems = driver.find_elements(By.XPATH, xpath)
+                            if elems:
+                                return elems
+                        except (IndexError, StaleElementReferenceException, NoSuchFrameException, WebDriverException):
+                            pass
+                        driver.switch_to.default_content()
+                        in_frame = False
+                    elif not blocked:
+                        # Todos os iframes foram inspecionados pelo JS: nao ha o que varrer aqui.
+                        profiler_sleep(min(ELEMENT_LOOKUP_POLL_SECONDS, max(0.0, deadline - time.time())))
+                        continue
+
             iframes = driver.find_elements(By.TAG_NAME, "iframe")
             if iframes and not iframe_count_logged:
                 logger.info(
@@ -221,31 +427,34 @@ def wait_for_elements(
                     len(iframes),
                 )
                 iframe_count_logged = True
+            # id/name/src so interessam ao log de debug: um unico script por varredura, e so se for logado.
+            frames_info = get_iframes_info(driver) if iframes and log_frame_attrs else []
 
             for idx in range(len(iframes)):
                 if time.time() >= deadline:
                     break
 
                 try:
-                    driver.switch_to.default_content()
+                    if in_frame:
+                        driver.switch_to.default_content()
+                        in_frame = False
                     current_iframes = driver.find_elements(By.TAG_NAME, "iframe")
                     if idx >= len(current_iframes):
                         continue
 
                     frame = current_iframes[idx]
-                    frame_id = frame.get_attribute("id")
-                    frame_name = frame.get_attribute("name")
-                    frame_src = frame.get_attribute("src")
-
-                    logger.debug(
-                        "wait_for_elements(%s): tentando iframe[%d] id=%s name=%s src=%s",
-                        tag,
-                        idx,
-                        frame_id,
-                        frame_name,
-                        frame_src,
-                    )
-
+                    if log_frame_attrs:
+                        info = frames_info[idx] if idx < len(frames_info) else {}
+                        logger.debug(
+                            "wait_for_elements(%s): tentando iframe[%d] id=%s name=%s src=%s",
+                            tag,
+                            idx,
+                            info.get("id"),
+                            info.get("name"),
+                            info.get("src"),
+                        )
+
+                    in_frame = True
                     driver.switch_to.frame(frame)
                     elems = driver.find_elements(By.XPATH, xpath)
                     if elems:
@@ -274,7 +483,7 @@ def wait_for_elements(
             f"Timeout aguardando elementos: tag={tag} xpath={xpath} timeout={timeout_seconds}s"
         )
     finally:
-        if restore_context:
+        if restore_context and in_frame:
             try:
                 driver.switch_to.default_content()
             except WebDriverException:
@@ -288,9 +497,9 @@ def wait_for_clickable(
     tag: str,
     timeout_seconds: int,
 ) -> Any:
-    wait_for_document_ready(driver, timeout_seconds, tag, logger)
+    # Um elemento clicavel ja implica pagina utilizavel; dispensa a espera previa por readyState.
     try:
-        return WebDriverWait(driver, timeout_seconds).until(
+        return get_wait(driver, timeout_seconds).until(
             EC.element_to_be_clickable((By.XPATH, xpath))
         )
     except TimeoutException as exc:
@@ -305,6 +514,48 @@ def wait_for_clickable(
         raise exc
 
 
+_FIRST_XPATH_MATCH_SCRIPT = (
+    "const xpaths = arguments[0];"
+    "for (let i = 0; i < xpaths.length; i++) {"
+    "  const n = document.evaluate(xpaths[i], document, null, "
+    "XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;"
+    "  if (n) { return [i, n]; }"
+    "}"
+    "return null;"
+)
+
+
+def retry_on_stale(
+    locate: Callable[[], Any],
+    action: Callable[[Any], Any],
+    *,
+    attempts: int = 3,
+) -> Any:
+    # O SEI re-renderiza listas entre o find e o clique; relocaliza e tenta de novo (0.1s, 0.2s, ...).
+    for attempt in range(max(1, attempts)):
+        try:
+            return action(locate())
+        except StaleElementReferenceException:
+            if attempt + 1 >= attempts:
+                raise
+            profiler_sleep(STALE_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+    return None
+
+
+def _scroll_and_click(driver: Any, elem: Any) -> None:
+    try:
+        driver.execute_script(
+            "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
+            elem,
+        )
+    except WebDriverException:
+        pass
+    try:
+        elem.click()
+    except (ElementClickInterceptedException, WebDriverException):
+        driver.execute_script("arguments[0].click();", elem)
+
+
 def click_xpath_with_retry(
     driver: Any,
     xpaths: List[str],
@@ -315,8 +566,32 @@ def click_xpath_with_retry(
     deadline = time.time() + (timeout_seconds or max(8.0, min(15.0, float(default_timeout_seconds))))
     last_error: Optional[BaseException] = None
     tried: List[str] = []
+    # Uma unica avaliacao JS testa todos os XPaths por ciclo; se o driver nao suportar, volta ao laco por XPath.
+    use_js_probe = True
 
     while time.time() < deadline:
+        if use_js_probe:
+            try:
+                match = driver.execute_script(_FIRST_XPATH_MATCH_SCRIPT, list(xpaths))
+            except (AttributeError, WebDriverException):
+                match = False
+            if match is None:
+                tried = list(dict.fromkeys(tried + list(xpaths)))
+                profiler_sleep(CLICK_RETRY_POLL_SECONDS)
+                continue
+            if isinstance(match, list) and len(match) == 2:
+                xpath = xpaths[int(match[0])]
+                if xpath not in tried:
+                    tried.append(xpath)
+                try:
+                    _scroll_and_click(driver, match[1])
+                    return xpath
+                except (StaleElementReferenceException, WebDriverException) as exc:
+                    last_error = exc
+                    profiler_sleep(CLICK_RETRY_POLL_SECONDS)
+                    continue
+            use_js_probe = False
+
         for xpath in xpaths:
             if xpath not in tried:
                 tried.append(xpath)
@@ -324,18 +599,7 @@ def click_xpath_with_retry(
                 elems = driver.find_elements(By.XPATH, xpath)
                 if not elems:
                     continue
-                elem = elems[0]
-                try:
-                    driver.execute_script(
-                        "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
-                        elem,
-                    )
-                except WebDriverException:
-                    pass
-                try:
-                    elem.click()
-                except (ElementClickInterceptedException, WebDriverException):
-                    driver.execute_script("arguments[0].click();", elem)
+                _scroll_and_click(driver, elems[0])
                 return xpath
             except (StaleElementReferenceException, WebDriverException) as exc:
                 last_error = exc
@@ -392,6 +392,10 @@ def export_dashboard_ready_csv(output_dir: Path, logger: Any = None) -> Dict[str
     ]
     csv_path = output_dir / "dashboard_ready_latest.csv"
     csv_writer.write_csv(rows, csv_path, columns=columns)
+    # Copia colunar lida pelo dashboard no lugar do CSV quando o pyarrow esta instalado.
+    parquet_path = csv_path.with_suffix(".parquet")
+    if not csv_writer.write_parquet(rows, parquet_path, columns=columns):
+        parquet_path.unlink(missing_ok=True)
     divergence_columns = [
         "processo",
         "quality_status",
@@ -419,4 +423,5 @@ def export_dashboard_ready_csv(output_dir: Path, logger: Any = None) -> Dict[str
         "csv_path": csv_path,
         "latest_path": csv_path,
         "divergence_path": divergence_path,
+        "parquet_path": parquet_path if parquet_path.exists() else None,
     }
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import json
+import logging
 import re
 from pathlib import Path
 from typing import Any, Dict, Iterable, List
 
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_LOG_LIMIT = 20
 
 OVERVIEW_COLUMNS = [
@@ -79,18 +82,63 @@ PT_DETAIL_COLUMNS = [
 
 PT_ATTRIBUICOES_ALIASES = ("atribuicoes_raw", "atribuições_raw")
 
+# Colunas de baixa cardinalidade usadas em filtros (isin) e agrupamentos do dashboard.
+OVERVIEW_CATEGORY_COLUMNS = ("preview_parceiro", "quality_status")
+
 
 def _empty_dataframe(columns: Iterable[str]) -> pd.DataFrame:
     return pd.DataFrame(columns=list(columns))
 
 
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow  # type: ignore
+
+        return True
+    except Exception:
+        return False
+
+
+# Leitor CSV nativo do Arrow quando instalado; o motor C do pandas segue como fallback.
+_CSV_ENGINES = ("pyarrow", "c") if _pyarrow_available() else ("c",)
+
+
 def _read_csv(path: Path, columns: Iterable[str] | None = None) -> pd.DataFrame:
     if not path.exists():
         return _empty_dataframe(columns or [])
+    df: pd.DataFrame | None = None
+    if "pyarrow" in _CSV_ENGINES:
+        try:
+            df = pd.read_csv(path, dtype=str, engine="pyarrow").fillna("")
+        except (ImportError, ValueError):
+            # ValueError cobre pyarrow.lib.ArrowInvalid e opcoes que o motor pyarrow nao suporta.
+            df = None
+    if df is None:
+        try:
+            df = pd.read_csv(path, dtype=str).fillna("")
+        except Exception as exc:
+            logger.warning("Falha ao ler CSV %s: %s", path, exc)
+            return _empty_dataframe(columns or [])
+    if columns:
+        for column in columns:
+            if column not in df.columns:
+                df[column] = ""
+        df = df[list(columns)]
+    return df
+
+
+def _read_parquet(path: Path, columns: Iterable[str] | None = None) -> pd.DataFrame | None:
     try:
-        df = pd.read_csv(path, dtype=str).fillna("")
+        import pyarrow.parquet as pq  # type: ignore
+
+        wanted = list(columns) if columns else None
+        if wanted:
+            # Le so as colunas exibidas que existem no arquivo; as demais entram vazias abaixo.
+            available = set(pq.read_schema(path).names)
+            wanted = [column for column in wanted if column in available]
+        df = pd.read_parquet(path, columns=wanted, engine="pyarrow").fillna("").astype(str)
     except Exception:
-        return _empty_dataframe(columns or [])
+        return None
     if columns:
         for column in columns:
             if column not in df.columns:
@@ -99,6 +147,16 @@ def _read_csv(path: Path, columns: Iterable[str] | None = None) -> pd.DataFrame:
     return df
 
 
+def _read_table(path: Path, columns: Iterable[str] | None = None) -> pd.DataFrame:
+    # Prefere a copia Parquet gerada junto com o CSV, desde que nao esteja defasada em relacao a ele.
+    parquet_path = path.with_suffix(".parquet")
+    if parquet_path.exists() and (not path.exists() or parquet_path.stat().st_mtime >= path.stat().st_mtime):
+        df = _read_parquet(parquet_path, columns)
+        if df is not None:
+            return df
+    return _read_csv(path, columns)
+
+
 def _read_json(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
@@ -133,18 +191,6 @@ def _clean_spaces(value: Any) -> str:
     return " ".join(str(value or "").replace("\r", "\n").split()).strip()
 
 
-def _to_bool(value: Any) -> bool:
-    normalized = _clean_spaces(value).lower()
-    return normalized in {"1", "true", "sim", "yes"}
-
-
-def _to_int(value: Any) -> int:
-    try:
-        return int(str(value or "").strip())
-    except Exception:
-        return 0
-
-
 def _to_float(value: Any) -> float:
     try:
         return float(str(value or "").replace(",", ".").strip())
@@ -152,6 +198,42 @@ def _to_float(value: Any) -> float:
         return 0.0
 
 
+# Conversoes por coluna com operacoes .str do pandas, em vez de apply celula a celula.
+_TRUE_VALUES = ("1", "true", "sim", "yes")
+_INT_PATTERN = r"[+-]?\d+"
+
+
+def _stripped(series: pd.Series) -> pd.Series:
+    return series.fillna("").astype(str).str.strip()
+
+
+def _series_to_bool(series: pd.Series) -> pd.Series:
+    return _stripped(series).str.lower().isin(_TRUE_VALUES)
+
+
+def _series_to_int(series: pd.Series) -> pd.Series:
+    stripped = _stripped(series)
+    numbers = pd.to_numeric(stripped.where(stripped.str.fullmatch(_INT_PATTERN)), errors="coerce")
+    return numbers.fillna(0).astype(int)
+
+
+def _series_to_float(series: pd.Series) -> pd.Series:
+    numbers = pd.to_numeric(_stripped(series).str.replace(",", ".", regex=False), errors="coerce")
+    return numbers.fillna(0.0).astype(float)
+
+
+def _series_has_text(series: pd.Series) -> pd.Series:
+    return _stripped(series) != ""
+
+
+def format_date_columns(df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    # Copia so para exibicao: dt.strftime vetorizado em vez de strftime por celula; o bundle segue com datetime.
+    result = df.copy()
+    for column in columns:
+        result[column] = result[column].dt.strftime("%Y-%m-%d").fillna("")
+    return result
+
+
 def _resolve_json_path(raw_path: Any, backend_output_dir: Path, root_dir: Path) -> Path | None:
     cleaned = _clean_spaces(raw_path)
     if not cleaned:
@@ -196,11 +278,16 @@ def _json_api_payload(path: Path | None) -> Dict[str, Any]:
     return api_payload if isinstance(api_payload, dict) else {}
 
 
+def _with_missing_columns(df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    # Um unico reindex acrescenta as colunas ausentes; sem nada faltando, so devolve uma copia.
+    missing = [column for column in columns if column not in df.columns]
+    if not missing:
+        return df.copy()
+    return df.reindex(columns=[*df.columns, *missing], fill_value="")
+
+
 def _ensure_pt_columns(df: pd.DataFrame) -> pd.DataFrame:
-    result = df.copy()
-    for column in PT_DETAIL_COLUMNS:
-        if column not in result.columns:
-            result[column] = ""
+    result = _with_missing_columns(df, PT_DETAIL_COLUMNS)
 
     for alias in PT_ATTRIBUICOES_ALIASES:
         if alias in result.columns:
@@ -210,44 +297,42 @@ def _ensure_pt_columns(df: pd.DataFrame) -> pd.DataFrame:
         result["atribuicoes_raw"] = ""
     result["atribuições_raw"] = result["atribuicoes_raw"]
 
-    result["captured_focus_fields"] = result["captured_focus_fields"].apply(_to_int)
+    result["captured_focus_fields"] = _series_to_int(result["captured_focus_fields"])
     for column in ("vigencia_inicio", "vigencia_fim", "prazo_inicio", "prazo_fim"):
         result[column] = pd.to_datetime(result[column], errors="coerce")
-    result["has_metas"] = result["metas_raw"].apply(lambda value: bool(_clean_spaces(value)))
-    result["has_acoes"] = result["acoes_raw"].apply(lambda value: bool(_clean_spaces(value)))
+    result["has_metas"] = _series_has_text(result["metas_raw"])
+    result["has_acoes"] = _series_has_text(result["acoes_raw"])
     result["has_prazo_estruturado"] = result["prazo_inicio"].notna() & result["prazo_fim"].notna()
     return result
 
 
 def _prepare_overview_df(df: pd.DataFrame) -> pd.DataFrame:
-    result = df.copy()
-    for column in OVERVIEW_COLUMNS:
-        if column not in result.columns:
-            result[column] = ""
-    result = result[OVERVIEW_COLUMNS]
+    result = df.reindex(columns=OVERVIEW_COLUMNS, fill_value="")
     for column in ("pt_gold", "act_gold", "memorando_gold", "ted_gold", "has_process_mismatch"):
-        result[column] = result[column].apply(_to_bool)
-    result["act_attempts_count"] = result["act_attempts_count"].apply(_to_int)
-    result["ted_valor_global_num"] = result["ted_valor_global"].apply(_to_float)
-    result["pt_present"] = result["pt_quality"].apply(lambda value: _clean_spaces(value) not in {"", "not_found"})
-    result["act_present"] = result["act_quality"].apply(lambda value: _clean_spaces(value) not in {"", "not_found"})
+        result[column] = _series_to_bool(result[column])
+    result["act_attempts_count"] = _series_to_int(result["act_attempts_count"])
+    result["ted_valor_global_num"] = _series_to_float(result["ted_valor_global"])
+    result["pt_present"] = ~_stripped(result["pt_quality"]).isin(("", "not_found"))
+    result["act_present"] = ~_stripped(result["act_quality"]).isin(("", "not_found"))
     result["memorando_present"] = result["memorando_gold"]
     result["ted_present"] = result["ted_gold"]
     for column in ("pt_vigencia_inicio", "pt_vigencia_fim", "act_data_inicio_vigencia", "act_data_fim_vigencia"):
         result[column] = pd.to_datetime(result[column], errors="coerce")
+    for column in OVERVIEW_CATEGORY_COLUMNS:
+        result[column] = result[column].astype("category")
     return result
 
 
 def _prepare_status_df(df: pd.DataFrame) -> pd.DataFrame:
     result = df.copy()
     if "found" in result.columns:
-        result["found"] = result["found"].apply(_to_bool)
+        result["found"] = _series_to_bool(result["found"])
     if "results_count" in result.columns:
-        result["results_count"] = result["results_count"].apply(_to_int)
+        result["results_count"] = _series_to_int(result["results_count"])
     if "text_chars" in result.columns:
-        result["text_chars"] = result["text_chars"].apply(_to_int)
+        result["text_chars"] = _series_to_int(result["text_chars"])
     if "tables_count" in result.columns:
-        result["tables_count"] = result["tables_count"].apply(_to_int)
+        result["tables_count"] = _series_to_int(result["tables_count"])
     return result
 
 
@@ -255,6 +340,7 @@ def dashboard_source_paths(root_dir: Path) -> List[Path]:
     backend_output_dir = root_dir / "backend" / "output"
     return [
         backend_output_dir / "dashboard_ready_latest.csv",
+        backend_output_dir / "dashboard_ready_latest.parquet",
         backend_output_dir / "pt_normalizado_latest.csv",
         backend_output_dir / "pt_auditoria_latest.csv",
         backend_output_dir / "act_normalizado_latest.csv",
@@ -282,7 +368,7 @@ def build_file_signature(paths: Iterable[Path]) -> tuple[tuple[str, bool, int, i
 
 def load_dashboard_bundle(root_dir: Path) -> Dict[str, Any]:
     backend_output_dir = root_dir / "backend" / "output"
-    overview_df = _prepare_overview_df(_read_csv(backend_output_dir / "dashboard_ready_latest.csv", OVERVIEW_COLUMNS))
+    overview_df = _prepare_overview_df(_read_table(backend_output_dir / "dashboard_ready_latest.csv", OVERVIEW_COLUMNS))
     pt_normalized_df = _ensure_pt_columns(_read_csv(backend_output_dir / "pt_normalizado_latest.csv"))
     pt_audit_df = _ensure_pt_columns(_read_csv(backend_output_dir / "pt_auditoria_latest.csv"))
     pt_status_df = _prepare_status_df(_read_csv(backend_output_dir / "pt_status_execucao_latest.csv"))
@@ -379,27 +465,35 @@ def filter_overview_df(
     has_memorando: str = "Todos",
     has_ted: str = "Todos",
 ) -> pd.DataFrame:
-    filtered = overview_df.copy()
+    # Uma mascara acumulada e um unico recorte no fim; sem filtro ativo devolve o proprio DataFrame.
+    mask: pd.Series | None = None
+
+    def narrow(condition: pd.Series) -> None:
+        nonlocal mask
+        mask = condition if mask is None else mask & condition
+
     if processos:
-        filtered = filtered[filtered["processo"].isin(processos)]
+        narrow(overview_df["processo"].isin(processos))
     if parceiros:
-        filtered = filtered[filtered["preview_parceiro"].isin(parceiros)]
+        narrow(overview_df["preview_parceiro"].isin(parceiros))
     if quality_statuses:
-        filtered = filtered[filtered["quality_status"].isin(quality_statuses)]
-
-    def apply_presence(df: pd.DataFrame, column: str, mode: str) -> pd.DataFrame:
+        narrow(overview_df["quality_status"].isin(quality_statuses))
+
+    for column, mode in (
+        ("pt_present", has_pt),
+        ("act_present", has_act),
+        ("memorando_present", has_memorando),
+        ("ted_present", has_ted),
+    ):
         normalized = _clean_spaces(mode).lower()
         if normalized == "com":
-            return df[df[column]]
-        if normalized == "sem":
-            return df[~df[column]]
-        return df
+            narrow(overview_df[column])
+        elif normalized == "sem":
+            narrow(~overview_df[column])
 
-    filtered = apply_presence(filtered, "pt_present", has_pt)
-    filtered = apply_presence(filtered, "act_present", has_act)
-    filtered = apply_presence(filtered, "memorando_present", has_memorando)
-    filtered = apply_presence(filtered, "ted_present", has_ted)
-    return filtered
+    if mask is None:
+        return overview_df
+    return overview_df[mask]
 
 
 def filter_by_processes(df: pd.DataFrame, processes: Iterable[str]) -> pd.DataFrame:
@@ -416,6 +510,31 @@ def pt_detail_dataframe(bundle: Dict[str, Any]) -> pd.DataFrame:
     return bundle.get("pt_normalized", _empty_dataframe([])).copy()
 
 
+_PERIOD_MARKERS = (
+    "janeiro",
+    "fevereiro",
+    "marco",
+    "abril",
+    "maio",
+    "junho",
+    "julho",
+    "agosto",
+    "setembro",
+    "outubro",
+    "novembro",
+    "dezembro",
+    "inicio",
+    "termino",
+    "semestre",
+    "anual",
+    "mensal",
+    "cada semestre",
+)
+# Marcadores e ano (4 digitos) numa unica alternancia: cada token e varrido uma vez so.
+_PERIOD_TOKEN_PATTERN = re.compile("|".join([*map(re.escape, _PERIOD_MARKERS), r"\d{4}"]))
+_ITEM_REF_PATTERN = re.compile(r"\d+[.)]?")
+
+
 def explode_pt_metas(pt_df: pd.DataFrame) -> pd.DataFrame:
     rows: List[Dict[str, Any]] = []
     for record in pt_df.to_dict(orient="records"):
@@ -425,7 +544,7 @@ def explode_pt_metas(pt_df: pd.DataFrame) -> pd.DataFrame:
         for item in [part.strip() for part in raw_value.split("||") if part.strip()]:
             parts = [_clean_spaces(part) for part in item.split("|") if _clean_spaces(part)]
             meta_ref = ""
-            if parts and re.fullmatch(r"\d+[.)]?", parts[0]):
+            if parts and _ITEM_REF_PATTERN.fullmatch(parts[0]):
                 meta_ref = parts[0]
                 parts = parts[1:]
             rows.append(
@@ -443,27 +562,7 @@ def _looks_like_period_token(value: str) -> bool:
     normalized = _clean_spaces(value).lower()
     if not normalized:
         return False
-    markers = (
-        "janeiro",
-        "fevereiro",
-        "marco",
-        "abril",
-        "maio",
-        "junho",
-        "julho",
-        "agosto",
-        "setembro",
-        "outubro",
-        "novembro",
-        "dezembro",
-        "inicio",
-        "termino",
-        "semestre",
-        "anual",
-        "mensal",
-        "cada semestre",
-    )
-    return any(marker in normalized for marker in markers) or bool(re.search(r"\d{4}", normalized))
+    return _PERIOD_TOKEN_PATTERN.search(normalized) is not None
 
 
 def explode_pt_acoes(pt_df: pd.DataFrame) -> pd.DataFrame:
@@ -475,7 +574,7 @@ def explode_pt_acoes(pt_df: pd.DataFrame) -> pd.DataFrame:
         for item in [part.strip() for part in raw_value.split("||") if part.strip()]:
             parts = [_clean_spaces(part) for part in item.split("|") if _clean_spaces(part)]
             acao_ref = ""
-            if parts and re.fullmatch(r"\d+[.)]?", parts[0]):
+            if parts and _ITEM_REF_PATTERN.fullmatch(parts[0]):
                 acao_ref = parts[0]
                 parts = parts[1:]
 
@@ -595,7 +694,9 @@ def process_explorer_payload(bundle: Dict[str, Any], processo: str) -> Dict[str,
     pt_rows = filter_by_processes(pt_detail_dataframe(bundle), [process_id]).to_dict(orient="records")
     act_rows = filter_by_processes(bundle.get("act_normalized", _empty_dataframe([])), [process_id]).to_dict(orient="records")
     memorando_rows = filter_by_processes(bundle.get("memorando_normalized", _empty_dataframe([])), [process_id]).to_dict(orient="records")
-    ted_rows = filter_by_processes(ted_detail_dataframe(bundle), [process_id]).to_dict(orient="records")
+    # O dashboard ja deixa o detalhe TED pronto no bundle; recalcular releria um JSON por processo.
+    ted_detail_df = bundle["ted_detail"] if "ted_detail" in bundle else ted_detail_dataframe(bundle)
+    ted_rows = filter_by_processes(ted_detail_df, [process_id]).to_dict(orient="records")
     return {
         "overview": overview_rows[0] if overview_rows else {},
         "pt": pt_rows[0] if pt_rows else {},
@@ -6,6 +6,12 @@ from typing import Any
 import pandas as pd
 
 
+def _excel_value(value: Any) -> Any:
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return value
+
+
 class ReportBuilder:
     def __init__(self, records: list[dict[str, Any]]):
         self.df = pd.DataFrame(records)
@@ -14,4 +20,12 @@ class ReportBuilder:
         self.df.to_csv(path, index=False, encoding="utf-8-sig")
 
     def to_excel(self, path: str | Path) -> None:
-        self.df.to_excel(path, index=False)
+        from openpyxl import Workbook
+
+        # Workbook write_only grava linha a linha em streaming, sem montar a grade de celulas em memoria.
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title="Sheet1")
+        sheet.append([str(column) for column in self.df.columns])
+        for row in self.df.itertuples(index=False, name=None):
+            sheet.append([_excel_value(value) for value in row])
+        workbook.save(path)
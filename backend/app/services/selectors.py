@@ -17,10 +17,12 @@ Regra respeitada:
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
 
+@lru_cache(maxsize=1)
 def load_selectors() -> Dict[str, Any]:
     """
     Carrega os seletores/XPaths do arquivo JSON do projeto.
@@ -33,6 +35,8 @@ def load_selectors() -> Dict[str, Any]:
     - Então subimos um nível (app/), entramos em rpa/ e lemos o JSON.
 
     Se o arquivo não existir, levantamos erro claro, porque sem seletores o scraping não funciona.
+
+    O resultado fica em cache: trate o dict retornado como somente leitura.
     """
     here = Path(__file__).resolve()
 
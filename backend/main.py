@@ -5,6 +5,7 @@ import logging
 import sys
 
 from app.config import get_settings
+from app.core.driver_factory import attach_chrome_driver
 from app.core.logging_config import setup_logging
 from app.rpa.scraping import SEIScraper
 
@@ -16,6 +17,12 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--auto-login", action="store_true", help="Try automated login")
     parser.add_argument("--max-internos", type=int, default=0)
     parser.add_argument("--max-processos", type=int, default=0)
+    parser.add_argument(
+        "--reuse-session",
+        metavar="HOST:PORT",
+        default="",
+        help="Attach to a Chrome already running with --remote-debugging-port instead of launching a new one",
+    )
     if hasattr(argparse, "BooleanOptionalAction"):
         parser.add_argument(
             "--stop-at-filter",
@@ -57,27 +64,27 @@ def main() -> None:
         settings.timeout_seconds,
     )
 
-    scraper = SEIScraper()
-    try:
-        scraper.run_full_flow(
-            manual_login=manual_login,
-            max_internos=max_internos,
-            max_processos_por_interno=max_processos,
-            stop_at_filter=args.stop_at_filter,
-        )
-        logger.info("Fluxo assistido finalizado")
-        if not args.stop_at_filter and sys.stdin and sys.stdin.isatty():
-            try:
-                input("Filtro aberto para debug manual. Pressione ENTER para encerrar o navegador...")
-            except EOFError:
-                logger.warning("STDIN indisponivel; encerrando navegador sem pausa adicional.")
-    except KeyboardInterrupt:
-        logger.warning("Execucao interrompida pelo usuario (Ctrl+C).")
-    finally:
+    # Navegador anexado continua aberto no fim: o SEIScraper so encerra o Chrome que ele mesmo criou.
+    driver = attach_chrome_driver(args.reuse_session) if args.reuse_session else None
+    if driver is not None:
+        logger.info("Reutilizando Chrome ja aberto em %s", args.reuse_session)
+
+    with SEIScraper(driver=driver) as scraper:
         try:
-            scraper.driver.quit()
-        except Exception as exc:
-            logger.debug("Driver ja encerrado ou indisponivel no encerramento: %s", exc)
+            scraper.run_full_flow(
+                manual_login=manual_login,
+                max_internos=max_internos,
+                max_processos_por_interno=max_processos,
+                stop_at_filter=args.stop_at_filter,
+            )
+            logger.info("Fluxo assistido finalizado")
+            if not args.stop_at_filter and sys.stdin and sys.stdin.isatty():
+                try:
+                    input("Filtro aberto para debug manual. Pressione ENTER para encerrar o navegador...")
+                except EOFError:
+                    logger.warning("STDIN indisponivel; encerrando navegador sem pausa adicional.")
+        except KeyboardInterrupt:
+            logger.warning("Execucao interrompida pelo usuario (Ctrl+C).")
 
 
 if __name__ == "__main__":
@@ -18,6 +18,7 @@ from backend.app.services.dashboard_streamlit_data import (
     explode_pt_metas,
     filter_by_processes,
     filter_overview_df,
+    format_date_columns,
     latest_log_rows,
     load_dashboard_bundle,
     memorando_detail_dataframe,
@@ -232,14 +233,27 @@ def _plotly_chart(target: Any, fig: Any, key: str) -> None:
     )
 
 
+# A assinatura (mtime/tamanho dos artefatos) entra na chave do cache: sem "_" no nome, o Streamlit a considera.
 @st.cache_data(show_spinner=False)
-def _load_bundle_cached(root_dir_str: str, _signature: tuple[tuple[str, bool, int, int], ...]) -> Dict[str, Any]:
+def _load_bundle_cached(root_dir_str: str, signature: tuple[tuple[str, bool, int, int], ...]) -> Dict[str, Any]:
     return load_dashboard_bundle(Path(root_dir_str))
 
 
+@st.cache_data(show_spinner=False)
+def _load_detail_frames_cached(root_dir_str: str, signature: tuple[tuple[str, bool, int, int], ...]) -> Dict[str, pd.DataFrame]:
+    # Memorando e TED leem um JSON por linha; so refaz quando os artefatos mudam, nao a cada filtro.
+    bundle = _load_bundle_cached(root_dir_str, signature)
+    return {
+        "memorando_detail": memorando_detail_dataframe(bundle),
+        "ted_detail": ted_detail_dataframe(bundle),
+    }
+
+
 def _refresh_bundle() -> Dict[str, Any]:
     signature = build_file_signature(dashboard_source_paths(ROOT_DIR))
-    return _load_bundle_cached(str(ROOT_DIR), signature)
+    bundle = _load_bundle_cached(str(ROOT_DIR), signature)
+    bundle.update(_load_detail_frames_cached(str(ROOT_DIR), signature))
+    return bundle
 
 
 def _status_badge(status: str) -> None:
@@ -325,8 +339,19 @@ def _start_collection(selected_labels: List[str], max_internos: int, max_process
     )
 
 
-def _format_date_column(series: pd.Series) -> pd.Series:
-    return series.apply(lambda value: value.strftime("%Y-%m-%d") if pd.notna(value) else "")
+def _count_by(series: pd.Series, *, sort_index: bool = False, head: int | None = None) -> pd.DataFrame:
+    # value_counts faz dropna + agrupamento + contagem num passo so; categorias sem linhas sao descartadas.
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    if sort_index:
+        counts = counts.sort_index()
+    if head is not None:
+        counts = counts.head(head)
+    return counts.rename_axis(series.name).reset_index(name="total")
+
+
+def _month_counts(series: pd.Series) -> pd.DataFrame:
+    return _count_by(series.dt.strftime("%Y-%m").rename("vigencia_mes"), sort_index=True)
 
 
 def _presence_filter(label: str, key: str) -> str:
@@ -436,8 +461,8 @@ def _render_overview_tab(bundle: Dict[str, Any], overview_df: pd.DataFrame) -> N
             {"tipo": "TED", "total": int(overview_df["ted_present"].sum())},
         ]
     )
-    quality_df = overview_df.groupby("quality_status", as_index=False).size().rename(columns={"size": "total"})
-    act_quality_df = overview_df.groupby("act_quality", as_index=False).size().rename(columns={"size": "total"})
+    quality_df = _count_by(overview_df["quality_status"])
+    act_quality_df = _count_by(overview_df["act_quality"])
     attempts_df = overview_df.sort_values("act_attempts_count", ascending=False).head(10)
 
     left, right = st.columns(2)
@@ -538,25 +563,10 @@ def _render_pt_tab(bundle: Dict[str, Any], filtered_processes: List[str]) -> Non
         st.info("Nenhum PT disponivel para os filtros atuais.")
         return
 
-    status_df = pt_detail_df.groupby("normalization_status", as_index=False).size().rename(columns={"size": "total"})
-    partners_df = (
-        pt_detail_df[pt_detail_df["publication_status"] == "published_gold"]
-        .groupby("parceiro", as_index=False)
-        .size()
-        .rename(columns={"size": "total"})
-        .sort_values("total", ascending=False)
-        .head(10)
-    )
-    period_df = pt_detail_df.groupby("period_source", as_index=False).size().rename(columns={"size": "total"})
-    timeline_df = pt_detail_df.dropna(subset=["vigencia_fim"]).copy()
-    if not timeline_df.empty:
-        timeline_df["vigencia_mes"] = timeline_df["vigencia_fim"].dt.to_period("M").astype(str)
-        timeline_df = (
-            timeline_df.groupby("vigencia_mes", as_index=False)
-            .size()
-            .rename(columns={"size": "total"})
-            .sort_values("vigencia_mes")
-        )
+    status_df = _count_by(pt_detail_df["normalization_status"])
+    partners_df = _count_by(pt_detail_df.loc[pt_detail_df["publication_status"] == "published_gold", "parceiro"], head=10)
+    period_df = _count_by(pt_detail_df["period_source"])
+    timeline_df = _month_counts(pt_detail_df["vigencia_fim"])
 
     metrics_chart_df = pt_metrics_df.sort_values(["metas_count", "acoes_count"], ascending=False).head(10) if not pt_metrics_df.empty else pd.DataFrame()
 
@@ -601,21 +611,22 @@ def _render_pt_tab(bundle: Dict[str, Any], filtered_processes: List[str]) -> Non
         )
 
     st.subheader("Tabela por processo")
-    process_table = pt_detail_df[
-        [
-            "processo",
-            "parceiro",
-            "objeto",
-            "vigencia_inicio",
-            "vigencia_fim",
-            "prazo_inicio",
-            "prazo_fim",
-            "normalization_status",
-            "publication_status",
-        ]
-    ].copy()
-    for column in ("vigencia_inicio", "vigencia_fim", "prazo_inicio", "prazo_fim"):
-        process_table[column] = _format_date_column(process_table[column])
+    process_table = format_date_columns(
+        pt_detail_df[
+            [
+                "processo",
+                "parceiro",
+                "objeto",
+                "vigencia_inicio",
+                "vigencia_fim",
+                "prazo_inicio",
+                "prazo_fim",
+                "normalization_status",
+                "publication_status",
+            ]
+        ],
+        ("vigencia_inicio", "vigencia_fim", "prazo_inicio", "prazo_fim"),
+    )
     st.dataframe(process_table, use_container_width=True, hide_index=True)
 
     st.subheader("Metas detalhadas")
@@ -656,24 +667,9 @@ def _render_act_tab(bundle: Dict[str, Any], overview_df: pd.DataFrame, filtered_
         st.info("Nenhum ACT disponivel para os filtros atuais.")
         return
 
-    act_quality_df = overview_df.groupby("act_quality", as_index=False).size().rename(columns={"size": "total"})
-    convenente_df = (
-        overview_df[overview_df["act_gold"]]
-        .groupby("act_orgao_convenente", as_index=False)
-        .size()
-        .rename(columns={"size": "total"})
-        .sort_values("total", ascending=False)
-        .head(10)
-    )
-    timeline_df = overview_df.dropna(subset=["act_data_fim_vigencia"]).copy()
-    if not timeline_df.empty:
-        timeline_df["vigencia_mes"] = timeline_df["act_data_fim_vigencia"].dt.to_period("M").astype(str)
-        timeline_df = (
-            timeline_df.groupby("vigencia_mes", as_index=False)
-            .size()
-            .rename(columns={"size": "total"})
-            .sort_values("vigencia_mes")
-        )
+    act_quality_df = _count_by(overview_df["act_quality"])
+    convenente_df = _count_by(overview_df.loc[overview_df["act_gold"], "act_orgao_convenente"], head=10)
+    timeline_df = _month_counts(overview_df["act_data_fim_vigencia"])
     rejection_chart_df = (
         act_rejections_df.groupby("rejection", as_index=False)["count"].sum().sort_values("count", ascending=False).head(10)
         if not act_rejections_df.empty
@@ -708,20 +704,21 @@ def _render_act_tab(bundle: Dict[str, Any], overview_df: pd.DataFrame, filtered_
         )
 
     st.subheader("ACTs canonicos")
-    canonical_table = overview_df[
-        [
-            "processo",
-            "act_numero_acordo",
-            "act_orgao_convenente",
-            "act_objeto",
-            "act_data_inicio_vigencia",
-            "act_data_fim_vigencia",
-            "act_quality",
-        ]
-    ].copy()
-    canonical_table = canonical_table[overview_df["act_gold"]]
-    for column in ("act_data_inicio_vigencia", "act_data_fim_vigencia"):
-        canonical_table[column] = _format_date_column(canonical_table[column])
+    canonical_table = format_date_columns(
+        overview_df.loc[
+            overview_df["act_gold"],
+            [
+                "processo",
+                "act_numero_acordo",
+                "act_orgao_convenente",
+                "act_objeto",
+                "act_data_inicio_vigencia",
+                "act_data_fim_vigencia",
+                "act_quality",
+            ],
+        ],
+        ("act_data_inicio_vigencia", "act_data_fim_vigencia"),
+    )
     st.dataframe(canonical_table, use_container_width=True, hide_index=True)
 
     st.subheader("Processos problematicos e trilha de rejeicoes")
@@ -739,7 +736,7 @@ def _render_act_tab(bundle: Dict[str, Any], overview_df: pd.DataFrame, filtered_
 
 def _render_memorando_tab(bundle: Dict[str, Any], filtered_processes: List[str]) -> None:
     memorando_status_df = filter_by_processes(bundle.get("memorando_status", pd.DataFrame()), filtered_processes)
-    memorando_detail_df = filter_by_processes(memorando_detail_dataframe(bundle), filtered_processes)
+    memorando_detail_df = filter_by_processes(bundle["memorando_detail"], filtered_processes)
 
     found = memorando_status_df[memorando_status_df.get("found", False)]["processo"].nunique() if not memorando_status_df.empty else 0
     published = memorando_status_df[memorando_status_df.get("publication_status", "") == "published_gold"]["processo"].nunique() if not memorando_status_df.empty else 0
@@ -755,7 +752,7 @@ def _render_memorando_tab(bundle: Dict[str, Any], filtered_processes: List[str])
         return
 
     if len(memorando_detail_df) > 1:
-        mode_df = memorando_detail_df.groupby("snapshot_mode", as_index=False).size().rename(columns={"size": "total"})
+        mode_df = _count_by(memorando_detail_df["snapshot_mode"])
         _plotly_chart(
             st,
             px.bar(mode_df, x="snapshot_mode", y="total", text="total", title="Memorandos por modo de extracao"),
@@ -767,7 +764,7 @@ def _render_memorando_tab(bundle: Dict[str, Any], filtered_processes: List[str])
 
 def _render_ted_tab(bundle: Dict[str, Any], filtered_processes: List[str]) -> None:
     ted_status_df = filter_by_processes(bundle.get("ted_status", pd.DataFrame()), filtered_processes)
-    ted_detail_df = filter_by_processes(ted_detail_dataframe(bundle), filtered_processes)
+    ted_detail_df = filter_by_processes(bundle["ted_detail"], filtered_processes)
 
     found = ted_status_df[ted_status_df.get("found", False)]["processo"].nunique() if not ted_status_df.empty else 0
     published = ted_status_df[ted_status_df.get("publication_status", "") == "published_gold"]["processo"].nunique() if not ted_status_df.empty else 0
@@ -781,7 +778,7 @@ def _render_ted_tab(bundle: Dict[str, Any], filtered_processes: List[str]) -> No
     c4.metric("Sem ACT previo", int(skipped_without_act))
 
     if not ted_status_df.empty:
-        reasons_df = ted_status_df.groupby("selection_reason", as_index=False).size().rename(columns={"size": "total"})
+        reasons_df = _count_by(ted_status_df["selection_reason"])
         _plotly_chart(
             st,
             px.bar(reasons_df, x="selection_reason", y="total", text="total", title="Distribuicao dos motivos de ausencia"),
@@ -798,14 +795,14 @@ def _render_ted_tab(bundle: Dict[str, Any], filtered_processes: List[str]) -> No
 
     left, right = st.columns(2)
     if ted_detail_df["situacao"].astype(str).str.strip().any():
-        situacao_df = ted_detail_df.groupby("situacao", as_index=False).size().rename(columns={"size": "total"})
+        situacao_df = _count_by(ted_detail_df["situacao"])
         _plotly_chart(
             left,
             px.bar(situacao_df, x="situacao", y="total", text="total", title="Situacao dos TEDs"),
             "ted_situacao_chart",
         )
     if ted_detail_df["uf"].astype(str).str.strip().any():
-        uf_df = ted_detail_df.groupby("uf", as_index=False).size().rename(columns={"size": "total"})
+        uf_df = _count_by(ted_detail_df["uf"])
         _plotly_chart(
             right,
             px.bar(uf_df, x="uf", y="total", text="total", title="UF dos TEDs"),
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app import config
+
+
+class SettingsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        # Ambiente vazio e sem .env: o resultado nao depende da maquina e nada vaza entre testes.
+        for patcher in (
+            patch.dict(os.environ, clear=True),
+            patch.dict(config._ENV, clear=True),
+            patch.object(config, "_find_env_path", return_value=None),
+            patch.object(config, "_ENV_LOADED", False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        config._load_env()
+        config.get_settings.cache_clear()
+
+    def tearDown(self) -> None:
+        config.get_settings.cache_clear()
+
+    def test_get_settings_is_memoized(self) -> None:
+        self.assertIs(config.get_settings(), config.get_settings())
+
+    def test_settings_parse_bool_and_int_values(self) -> None:
+        env = {"HEADLESS": "'TRUE'", "TIMEOUT_SECONDS": "7", "MANUAL_LOGIN": "0", "DEBUG": "on"}
+        with patch.dict(config._ENV, env, clear=False):
+            settings = config.get_settings()
+
+        self.assertTrue(settings.headless)
+        self.assertEqual(settings.timeout_seconds, 7)
+        self.assertFalse(settings.manual_login)
+        self.assertTrue(settings.debug)
+
+    def test_page_load_strategy_is_read_lowercased(self) -> None:
+        with patch.dict(config._ENV, {"PAGE_LOAD_STRATEGY": "Eager"}, clear=False):
+            settings = config.get_settings()
+
+        self.assertEqual(settings.page_load_strategy, "eager")
+
+    def test_wait_poll_ms_has_a_floor(self) -> None:
+        with patch.dict(config._ENV, {"WAIT_POLL_MS": "0"}, clear=False):
+            settings = config.get_settings()
+
+        self.assertEqual(settings.wait_poll_ms, 10)
+
+    def test_settings_fall_back_to_default_on_invalid_int(self) -> None:
+        with patch.dict(config._ENV, {"TIMEOUT_SECONDS": "abc"}, clear=False):
+            settings = config.get_settings()
+
+        self.assertEqual(settings.timeout_seconds, 20)
+
+    def test_only_outer_quotes_and_spaces_are_stripped(self) -> None:
+        with patch.dict(config._ENV, {"TIMEOUT_SECONDS": " '15' ", "WAIT_POLL_MS": "1 5"}, clear=False):
+            settings = config.get_settings()
+
+        self.assertEqual(settings.timeout_seconds, 15)
+        self.assertEqual(settings.wait_poll_ms, 100)
+
+    def test_legacy_env_names_are_copied_to_canonical_keys(self) -> None:
+        with patch.dict(os.environ, {"URL": "https://sei.example/"}, clear=False), patch.dict(config._ENV):
+            os.environ.pop("SEI_URL", None)
+            config._snapshot_env()
+            settings = config.get_settings()
+
+        self.assertEqual(settings.sei_url, "https://sei.example/")
+
+    def test_canonical_env_name_wins_over_legacy(self) -> None:
+        env = {"URL": "https://legado.example/", "SEI_URL": "https://canonico.example/"}
+        with patch.dict(os.environ, env, clear=False), patch.dict(config._ENV):
+            config._snapshot_env()
+            settings = config.get_settings()
+
+        self.assertEqual(settings.sei_url, "https://canonico.example/")
+
+    def test_aliases_resolve_in_snapshot_without_touching_os_environ(self) -> None:
+        env = {"USER": "login_local", "USERNAME": "login_local", "url_sei": "https://sei.example/"}
+        with patch.dict(os.environ, env, clear=False), patch.dict(config._ENV):
+            config._snapshot_env()
+            settings = config.get_settings()
+
+            self.assertNotIn("SEI_URL", os.environ)
+            self.assertNotIn("SEI_USERNAME", os.environ)
+
+        self.assertEqual(settings.sei_url, "https://sei.example/")
+        self.assertIsNone(settings.username)
+
+    def test_first_env_returns_first_non_empty_value(self) -> None:
+        with patch.dict(config._ENV, {"URL": "", "url_sei": "https://sei.example/"}, clear=False):
+            self.assertEqual(config.first_env("URL", "url_sei"), "https://sei.example/")
+            self.assertEqual(config.first_env("NAO_EXISTE", default="x"), "x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,8 +7,11 @@ import sys
 import unittest
 from pathlib import Path
 
+import pandas as pd
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
 
+from app.output import csv_writer
 from app.services.dashboard_exporter import export_dashboard_ready_csv
 
 
@@ -262,6 +265,9 @@ class DashboardExporterTests(unittest.TestCase):
                 rows = list(csv.DictReader(file_obj))
 
             self.assertEqual(len(rows), 22)
+            if csv_writer.parquet_available():
+                parquet_rows = pd.read_parquet(result["parquet_path"]).to_dict(orient="records")
+                self.assertEqual(parquet_rows, rows)
 
             row_1 = next(row for row in rows if row["processo"] == "60090.000001/2026-01")
             self.assertEqual(row_1["pt_gold"], "True")
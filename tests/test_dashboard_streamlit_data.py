@@ -12,8 +12,12 @@ import pandas as pd
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from backend.app.services.dashboard_streamlit_data import (
+    _CSV_ENGINES,
+    _prepare_status_df,
     explode_pt_acoes,
     explode_pt_metas,
+    filter_overview_df,
+    format_date_columns,
     load_dashboard_bundle,
     memorando_detail_dataframe,
     parse_act_rejection_summary,
@@ -159,6 +163,7 @@ class DashboardStreamlitDataTests(unittest.TestCase):
         self.assertEqual(len(overview_df), 1)
         self.assertTrue(bool(overview_df.iloc[0]["pt_gold"]))
         self.assertEqual(int(overview_df.iloc[0]["act_attempts_count"]), 2)
+        self.assertIsInstance(overview_df["quality_status"].dtype, pd.CategoricalDtype)
 
         log_summary = summarize_log_entries(bundle["log_entries"])
         self.assertEqual(log_summary["info"], 1)
@@ -178,6 +183,78 @@ class DashboardStreamlitDataTests(unittest.TestCase):
         self.assertEqual(bundle["log_entries"], [])
         self.assertEqual(bundle["performance"], {})
 
+    def test_unreadable_csv_is_logged_and_loaded_as_empty(self) -> None:
+        (self.root_dir / "backend" / "output" / "act_normalizado_latest.csv").write_text("", encoding="utf-8")
+
+        with self.assertLogs("backend.app.services.dashboard_streamlit_data", level="WARNING") as logs:
+            bundle = load_dashboard_bundle(self.root_dir)
+
+        self.assertTrue(bundle["act_normalized"].empty)
+        self.assertIn("act_normalizado_latest.csv", logs.output[0])
+
+    def test_load_dashboard_bundle_prefers_fresh_parquet_copy(self) -> None:
+        if "pyarrow" not in _CSV_ENGINES:
+            self.skipTest("pyarrow indisponivel")
+        backend_output = self.root_dir / "backend" / "output"
+        _write_csv(backend_output / "dashboard_ready_latest.csv", ["processo"], [{"processo": "csv"}])
+        pd.DataFrame({"processo": ["parquet"], "pt_gold": ["True"]}).to_parquet(
+            backend_output / "dashboard_ready_latest.parquet",
+            index=False,
+        )
+
+        overview_df = load_dashboard_bundle(self.root_dir)["overview"]
+
+        self.assertEqual(overview_df["processo"].tolist(), ["parquet"])
+        self.assertTrue(bool(overview_df.iloc[0]["pt_gold"]))
+        self.assertEqual(overview_df.iloc[0]["act_attempts_count"], 0)
+
+    def test_date_columns_are_formatted_for_display_without_touching_the_bundle(self) -> None:
+        _write_csv(
+            self.root_dir / "backend" / "output" / "dashboard_ready_latest.csv",
+            ["processo", "act_data_inicio_vigencia", "act_data_fim_vigencia"],
+            [
+                {"processo": "1", "act_data_inicio_vigencia": "2026-01-15", "act_data_fim_vigencia": "2027-06-30"},
+                {"processo": "2", "act_data_inicio_vigencia": "", "act_data_fim_vigencia": ""},
+            ],
+        )
+        overview_df = load_dashboard_bundle(self.root_dir)["overview"]
+
+        table = format_date_columns(
+            overview_df[["processo", "act_data_inicio_vigencia", "act_data_fim_vigencia"]],
+            ("act_data_inicio_vigencia", "act_data_fim_vigencia"),
+        )
+
+        self.assertEqual(table["act_data_inicio_vigencia"].tolist(), ["2026-01-15", ""])
+        self.assertEqual(table["act_data_fim_vigencia"].tolist(), ["2027-06-30", ""])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(overview_df["act_data_fim_vigencia"]))
+
+    def test_filter_overview_df_combines_filters_in_one_mask(self) -> None:
+        overview_df = pd.DataFrame(
+            {
+                "processo": ["1", "2", "3"],
+                "preview_parceiro": ["A", "B", "A"],
+                "quality_status": ["high", "high", "low"],
+                "pt_present": [True, True, False],
+            }
+        )
+
+        self.assertIs(filter_overview_df(overview_df), overview_df)
+        filtered = filter_overview_df(overview_df, parceiros=["A"], has_pt="Com")
+        self.assertEqual(filtered["processo"].tolist(), ["1"])
+
+    def test_status_columns_are_converted_per_column(self) -> None:
+        status_df = _prepare_status_df(
+            pd.DataFrame(
+                {
+                    "found": [" true", "SIM", "0", ""],
+                    "results_count": ["3", " 12 ", "1.5", "abc"],
+                }
+            )
+        )
+
+        self.assertEqual(status_df["found"].tolist(), [True, True, False, False])
+        self.assertEqual(status_df["results_count"].tolist(), [3, 12, 0, 0])
+
     def test_pt_explosions_break_out_metas_and_acoes(self) -> None:
         pt_df = pd.DataFrame(
             [
@@ -19,8 +19,10 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
 
 from app.documents.types import DocumentTypeSpec
 from app.rpa import scraping
+from app.rpa import selenium_utils
 from app.rpa.sei import document_search
 from app.rpa.sei import document_text_extractor
+from app.rpa.sei import process_navigation
 from app.rpa.sei import toolbar_actions
 
 
@@ -87,12 +89,13 @@ class FakeConditionalWait:
 
 
 class PopupElement:
-    def __init__(self, *, fail_clicks: int = 0) -> None:
+    def __init__(self, *, fail_clicks: int = 0, displayed: bool = True) -> None:
         self.fail_clicks = fail_clicks
+        self.displayed = displayed
         self.clicks = 0
 
     def is_displayed(self) -> bool:
-        return True
+        return self.displayed
 
     def is_enabled(self) -> bool:
         return True
@@ -620,6 +623,173 @@ class WaitOptimizationTests(unittest.TestCase):
         self.assertEqual(element.clicks, 2)
         self.assertGreater(clock.time(), 0.0)
 
+    def test_get_elements_text_reads_all_texts_in_one_script_call(self) -> None:
+        driver = Mock()
+        driver.execute_script.return_value = [" 123 ", None, "456"]
+        elems = [FakeRow("x"), FakeRow("y"), FakeRow("z")]
+
+        texts = selenium_utils.get_elements_text(driver, elems)
+
+        self.assertEqual(texts, ["123", "", "456"])
+        driver.execute_script.assert_called_once()
+
+    def test_get_elements_text_falls_back_to_element_text(self) -> None:
+        driver = Mock()
+        driver.execute_script.side_effect = WebDriverException("sem js")
+
+        texts = selenium_utils.get_elements_text(driver, [FakeRow(" 123 "), FakeRow("")])
+
+        self.assertEqual(texts, ["123", ""])
+
+    def test_wait_for_elements_skips_ready_state_when_xpath_already_matches(self) -> None:
+        driver = Mock()
+        driver.find_elements.return_value = [FakeRow("x")]
+
+        elems = selenium_utils.wait_for_elements(driver, DummyLogger(), "//x", "tag", timeout_seconds=5)
+
+        self.assertEqual(len(elems), 1)
+        driver.execute_script.assert_not_called()
+        driver.switch_to.default_content.assert_called_once()
+
+    def test_wait_for_elements_switches_straight_to_frame_found_by_script(self) -> None:
+        frame = object()
+        match = FakeRow("x")
+        driver = Mock()
+        driver.find_elements.side_effect = [[], [], [match]]
+        driver.execute_script.side_effect = ["complete", [frame, [], 0]]
+
+        elems = selenium_utils.wait_for_elements(driver, DummyLogger(), "//x", "tag", timeout_seconds=5)
+
+        self.assertEqual(elems, [match])
+        driver.switch_to.frame.assert_called_once_with(frame)
+        # Um switch para o topo no inicio e outro ao restaurar o contexto apos o iframe.
+        self.assertEqual(driver.switch_to.default_content.call_count, 2)
+
+    def test_wait_for_elements_follows_nested_frame_path_from_script(self) -> None:
+        top_frame, inner_frames = object(), [object(), object()]
+        match = FakeRow("x")
+        driver = Mock()
+        driver.find_elements.side_effect = [[], [], inner_frames, [match]]
+        driver.execute_script.side_effect = ["complete", [top_frame, [1], 0]]
+
+        elems = selenium_utils.wait_for_elements(driver, DummyLogger(), "//x", "tag", timeout_seconds=5)
+
+        self.assertEqual(elems, [match])
+        self.assertEqual(
+            [c.args[0] for c in driver.switch_to.frame.call_args_list],
+            [top_frame, inner_frames[1]],
+        )
+
+    def test_get_iframes_info_reads_all_frames_in_one_script_call(self) -> None:
+        frames = [{"index": 0, "id": "ifrArvore", "name": "ifrArvore", "src": "arvore.php"}]
+        driver = Mock()
+        driver.execute_script.return_value = frames
+
+        self.assertEqual(selenium_utils.get_iframes_info(driver), frames)
+        driver.execute_script.assert_called_once()
+        driver.find_elements.assert_not_called()
+
+    def test_click_xpath_with_retry_probes_all_xpaths_in_one_script_call(self) -> None:
+        element = PopupElement()
+        driver = Mock()
+        driver.execute_script.side_effect = lambda script, *args: [1, element] if args and isinstance(args[0], list) else None
+
+        clicked = selenium_utils.click_xpath_with_retry(driver, ["//a", "//b"], "teste", default_timeout_seconds=1)
+
+        self.assertEqual(clicked, "//b")
+        self.assertEqual(element.clicks, 1)
+        driver.find_elements.assert_not_called()
+
+    def test_open_processo_clicks_by_text_in_one_script_call(self) -> None:
+        driver = Mock()
+        driver.window_handles = ["main"]
+        driver.current_url = "https://sei.example/processo"
+        driver.title = "Processo"
+        driver._sei_timeout_seconds = 5
+
+        def fake_click(script: str, xpath: str, text: str) -> bool:
+            driver.window_handles = ["main", "nova"]
+            return True
+
+        driver.execute_script.side_effect = fake_click
+        selectors = {"interno": {"processo": "//a[@class='processo']"}}
+
+        with patch.object(process_navigation, "selenium_wait_for_elements") as wait_mock:
+            result = process_navigation.open_processo(driver, "123", selectors, DummyLogger())
+
+        self.assertEqual(result, ("nova", "https://sei.example/processo", "Processo"))
+        wait_mock.assert_not_called()
+        driver.switch_to.window.assert_called_once_with("nova")
+
+    def test_open_processo_fallback_filters_by_text_in_the_xpath(self) -> None:
+        driver = Mock()
+        driver.window_handles = ["main"]
+        driver.current_url = "https://sei.example/processo"
+        driver.title = "Processo"
+        driver._sei_timeout_seconds = 5
+        driver.execute_script.return_value = False
+        link = Mock()
+        link.click.side_effect = lambda: setattr(driver, "window_handles", ["main", "nova"])
+        selectors = {"interno": {"processo": "//a[@class='processo']"}}
+
+        with patch.object(process_navigation, "selenium_wait_for_elements", return_value=[link]) as wait_mock:
+            result = process_navigation.open_processo(driver, "123", selectors, DummyLogger())
+
+        self.assertEqual(result[0], "nova")
+        self.assertEqual(wait_mock.call_args.args[2], "(//a[@class='processo'])[normalize-space()='123']")
+
+    def test_open_processo_raises_runtime_error_when_processo_is_missing(self) -> None:
+        driver = Mock()
+        driver.window_handles = ["main"]
+        driver._sei_timeout_seconds = 5
+        driver.execute_script.return_value = False
+        selectors = {"interno": {"processo": "//a[@class='processo']"}}
+
+        for outcome in (TimeoutException("sem lista"), []):
+            with self.subTest(outcome=outcome), patch.object(
+                process_navigation,
+                "selenium_wait_for_elements",
+                side_effect=outcome if isinstance(outcome, Exception) else None,
+                return_value=outcome,
+            ), patch.object(process_navigation, "selenium_log_iframe_hint", return_value=[]) as hint_mock:
+                with self.assertRaisesRegex(RuntimeError, "Nao consegui abrir o processo: 123"):
+                    process_navigation.open_processo(driver, "123", selectors, DummyLogger())
+                hint_mock.assert_called_once()
+
+    def test_batched_text_scripts_ignore_unrendered_elements_like_webelement_text(self) -> None:
+        self.assertIn("getClientRects().length", selenium_utils.RENDERED_TEXT_JS)
+        for script in (
+            selenium_utils._ELEMENTS_TEXT_SCRIPT,
+            selenium_utils._XPATH_TEXTS_SCRIPT,
+            selenium_utils._CLICK_BY_TEXT_SCRIPT,
+            document_search._LINK_KEYS_SCRIPT,
+            scraping.INTERNO_ROWS_BODY,
+        ):
+            with self.subTest(script=script[:40]):
+                self.assertIn(selenium_utils.RENDERED_TEXT_JS, script)
+                self.assertNotIn("textContent", script)
+
+    def test_retry_on_stale_relocates_with_backoff(self) -> None:
+        element = PopupElement()
+        actions = [StaleElementReferenceException("stale"), StaleElementReferenceException("stale"), None]
+        locate = Mock(return_value=element)
+
+        def action(elem: Any) -> str:
+            outcome = actions.pop(0)
+            if outcome is not None:
+                raise outcome
+            return "ok"
+
+        with patch("app.rpa.selenium_utils.profiler_sleep") as sleep_mock:
+            result = selenium_utils.retry_on_stale(locate, action)
+
+        self.assertEqual(result, "ok")
+        self.assertEqual(locate.call_count, 3)
+        self.assertEqual([c.args[0] for c in sleep_mock.call_args_list], [0.1, 0.2])
+
+    def test_xpath_text_literal_escapes_mixed_quotes(self) -> None:
+        self.assertEqual(selenium_utils.xpath_text_literal("a'b\"c"), "concat('a', \"'\", 'b\"c')")
+
     def test_wait_for_page_signature_change_returns_early_when_rows_change(self) -> None:
         clock = FakeClock()
         previous_signature = scraping._build_rows_signature([FakeRow("linha atual")])
@@ -643,6 +813,174 @@ class WaitOptimizationTests(unittest.TestCase):
 
         self.assertTrue(changed)
 
+    def test_click_first_clickable_skips_hidden_match_for_later_candidate(self) -> None:
+        scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+        scraper.logger = DummyLogger()
+        scraper.timeout_seconds = 5
+        hidden = PopupElement(displayed=False)
+        clickable = PopupElement()
+        elements = {"//a": [hidden], "//b": [clickable]}
+        scraper.driver = Mock()
+        scraper.driver.find_elements.side_effect = lambda _by, xpath: elements.get(xpath, [])
+
+        scraping.SEIScraper._click_first_clickable(scraper, ["//a", "//b", "//a", ""], "menu")
+
+        self.assertEqual(hidden.clicks, 0)
+        self.assertEqual(clickable.clicks, 1)
+        self.assertEqual(scraper.driver.find_elements.call_count, 2)
+
+    def test_click_first_clickable_rejects_empty_candidate_list(self) -> None:
+        scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+        scraper.driver = Mock()
+
+        with self.assertRaises(ValueError):
+            scraping.SEIScraper._click_first_clickable(scraper, ["", ""], "menu")
+
+    def test_save_session_cookies_creates_owner_only_file(self) -> None:
+        temp_dir = (Path(__file__).resolve().parent / "_tmp_session_cookies").resolve()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        try:
+            scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+            scraper.logger = DummyLogger()
+            scraper.settings = SimpleNamespace(session_cookies_file=str(temp_dir / "cookies.json"))
+            scraper.driver = Mock()
+            scraper.driver.get_cookies.return_value = [{"name": "PHPSESSID", "value": "abc"}]
+
+            with patch("app.rpa.scraping.os.open", wraps=os.open) as os_open:
+                scraping.SEIScraper._save_session_cookies(scraper)
+
+            self.assertEqual(os_open.call_args.args[2], 0o600)
+            self.assertEqual(sorted(path.name for path in temp_dir.iterdir()), ["cookies.json"])
+            self.assertIn("PHPSESSID", (temp_dir / "cookies.json").read_text(encoding="utf-8"))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_gateway_timeout_check_reads_bounded_body_text_instead_of_page_source(self) -> None:
+        scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+        scraper.driver = Mock(title="", current_url="https://sei.example/sei/")
+        scraper.driver.execute_script.return_value = "504 Gateway Time-out"
+
+        self.assertTrue(scraping.SEIScraper._is_gateway_timeout_page(scraper))
+
+        scraper.driver = Mock(title="SEI - Controle de Processos", current_url="https://sei.example/sei/")
+        self.assertFalse(scraping.SEIScraper._is_gateway_timeout_page(scraper))
+        scraper.driver.execute_script.assert_not_called()
+
+    def test_collect_interno_rows_reads_whole_page_in_one_script_call(self) -> None:
+        scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+        scraper.selectors = {"interno": {}}
+        scraper.logger = DummyLogger()
+        scraper.timeout_seconds = 5
+        rows = [Mock(), Mock()]
+        link = Mock()
+        scraper.wait_for_elements = Mock(return_value=rows)  # type: ignore[method-assign]
+        scraper.driver = Mock()
+        scraper.driver.execute_script.return_value = [
+            [link, " 123 ", ["123", "Parcerias Vigentes"], []],
+            [None, "", [], []],
+        ]
+
+        internos = scraping.SEIScraper._collect_interno_rows_current_page(scraper, page=1)
+
+        self.assertEqual(len(internos), 1)
+        self.assertIs(internos[0].link, link)
+        self.assertEqual(internos[0].numero_interno, "123")
+        self.assertEqual(internos[0].descricao_normalizada, "PARCERIAS VIGENTES")
+        for row in rows:
+            row.find_elements.assert_not_called()
+
+    def test_interno_rows_reader_is_installed_only_when_missing(self) -> None:
+        scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+        scraper.driver = Mock()
+        scraper.driver.execute_script.side_effect = [scraping.INTERNO_ROWS_MISSING, [[None, "", [], []]]]
+
+        batched = scraping.SEIScraper._read_interno_rows_js(scraper, [Mock()], ".//a", ".//td")
+
+        self.assertEqual(batched, [(None, "", [], [])])
+        scripts = [c.args[0] for c in scraper.driver.execute_script.call_args_list]
+        self.assertEqual(scripts, [scraping.INTERNO_ROWS_CALL_SCRIPT, scraping.INTERNO_ROWS_INSTALL_SCRIPT])
+
+    def test_find_elements_any_context_reads_iframe_list_once(self) -> None:
+        scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+        frames = [object(), object(), object()]
+        match = FakeRow("x")
+        current: dict[str, Any] = {"frame": None}
+        scraper.driver = Mock()
+        scraper.driver.switch_to.frame.side_effect = lambda frame: current.update(frame=frame)
+        scraper.driver.switch_to.default_content.side_effect = lambda: current.update(frame=None)
+
+        def find_elements(by: Any, value: str) -> list[Any]:
+            if by == By.TAG_NAME:
+                return list(frames)
+            return [match] if current["frame"] is frames[2] else []
+
+        scraper.driver.find_elements.side_effect = find_elements
+
+        self.assertEqual(scraping.SEIScraper._find_elements_any_context(scraper, "//x"), [match])
+        iframe_queries = [c for c in scraper.driver.find_elements.call_args_list if c.args[0] == By.TAG_NAME]
+        self.assertEqual(len(iframe_queries), 1)
+
+    def test_selected_interno_link_is_located_by_text_in_xpath(self) -> None:
+        scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+        scraper.selectors = {"interno": {}}
+        link = Mock()
+        scraper.driver = Mock()
+        scraper.driver.find_elements.return_value = [link]
+        selected = scraping.InternoRow(
+            "123", "Parcerias", "PARCERIAS", None, page=1, row_index=4, numero_interno_raw="123"
+        )
+
+        found = scraping.SEIScraper._locate_selected_interno_link_by_text(scraper, selected)
+
+        self.assertIs(found, link)
+        xpath = scraper.driver.find_elements.call_args.args[1]
+        self.assertEqual(
+            xpath,
+            "(//tr[td])//a[contains(@class,'ancoraBlocoAberto')][normalize-space()='123']",
+        )
+
+        scraper.driver.find_elements.return_value = [Mock(), Mock()]
+        self.assertIsNone(scraping.SEIScraper._locate_selected_interno_link_by_text(scraper, selected))
+
+    def test_selected_interno_link_xpath_uses_displayed_text_not_normalized(self) -> None:
+        scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+        scraper.selectors = {"interno": {}}
+        scraper.driver = Mock()
+        scraper.driver.find_elements.return_value = [Mock()]
+        numero_raw = "Bloco Técnico 12"
+        selected = scraping.InternoRow(
+            scraping.SEIScraper._normalize_text(scraper, numero_raw),
+            "Parcerias",
+            "PARCERIAS",
+            None,
+            page=1,
+            row_index=1,
+            numero_interno_raw=numero_raw,
+        )
+        self.assertNotEqual(selected.numero_interno, numero_raw)
+
+        scraping.SEIScraper._locate_selected_interno_link_by_text(scraper, selected)
+
+        xpath = scraper.driver.find_elements.call_args.args[1]
+        self.assertTrue(xpath.endswith("[normalize-space()='Bloco Técnico 12']"))
+
+    def test_post_login_wait_confirms_menu_from_single_probe(self) -> None:
+        scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
+        scraper.selectors = {"tela_inicio": {"bloco": "//menu"}}
+        scraper.logger = DummyLogger()
+        scraper.driver = Mock()
+        scraper.driver.execute_script.return_value = [
+            "https://sei.example/sip/login.php?sigla_sistema=SEI",
+            "SEI",
+            True,
+            "",
+        ]
+
+        scraping.SEIScraper._wait_for_post_login_ready(scraper, 5)
+
+        scraper.driver.execute_script.assert_called_once()
+        scraper.driver.find_elements.assert_not_called()
+
     def test_click_next_page_keeps_sleep_fallback_when_no_signal_is_detectable(self) -> None:
         scraper = scraping.SEIScraper.__new__(scraping.SEIScraper)
         scraper.selectors = {"interno": {"paginacao_proxima": "//next", "tabela_blocos_rows": "//rows"}}
@@ -951,6 +1289,12 @@ class WaitOptimizationTests(unittest.TestCase):
         self.assertGreaterEqual(clock.time(), 3.0)
         self.assertLess(clock.time(), 3.5)
 
+    def test_toolbar_poll_follows_configured_wait_poll(self) -> None:
+        driver = SimpleNamespace(_sei_wait_poll_seconds=0.05)
+        self.assertEqual(toolbar_actions._resolve_poll_seconds(driver, 0.2), 0.05)
+        self.assertEqual(toolbar_actions._resolve_poll_seconds(SimpleNamespace(), 0.2), 0.2)
+        self.assertEqual(toolbar_actions._resolve_poll_seconds(Mock(), 0.2), 0.2)
+
     def test_collect_result_links_returns_early_on_explicit_no_results(self) -> None:
         clock = FakeClock()
         driver = SearchNoResultsDriver()